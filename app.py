@@ -2,20 +2,25 @@
 import streamlit as st
 import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # ── Modular imports ────────────────────────────────────────────────────────
 from src.data import get_spy_data, get_yahoo_options_chain, generate_demo_options_data
-from src.analysis import calculate_indicators, calculate_iron_condor_score, find_iron_condor_strikes
-from src.paper import initialize_paper_trading
+from src.analysis import (
+    df_fingerprint,
+    calculate_indicators,
+    calculate_iron_condor_score,
+    index_options_chain,
+    find_iron_condor_strikes_indexed
+)
 from ui.components import (
+    inject_theme_css,
     display_header,
     display_signal_box,
     display_current_metrics,
     display_expiry_selector
 )
-from ui.paper_trading_ui import display_paper_trading_panel
-from ui.professional_chart import display_professional_chart
 
 # ── Page config ────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -25,337 +30,112 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ── Dark Professional Theme CSS ────────────────────────────────────────────
-st.markdown("""
-<style>
-    /* ── Base Dark Theme ────────────────────────────────────── */
-    .stApp {
-        background: linear-gradient(180deg, #0a0e17 0%, #111827 100%);
-        color: #e2e8f0;
-    }
-
-    /* ── Header ──────────────────────────────────────────────── */
-    .main-header {
-        font-size: 42px;
-        font-weight: 800;
-        background: linear-gradient(135deg, #00d2ff, #3a7bd5);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 4px;
-        letter-spacing: -0.5px;
-    }
-    .sub-header {
-        font-size: 16px;
-        color: #64748b;
-        text-align: center;
-        margin-bottom: 30px;
-        letter-spacing: 2px;
-        text-transform: uppercase;
-    }
-
-    /* ── Signal Boxes ────────────────────────────────────────── */
-    .signal-strong-entry {
-        background: linear-gradient(135deg, #064e3b, #059669);
-        padding: 22px;
-        border-radius: 12px;
-        color: #ecfdf5;
-        font-size: 26px;
-        font-weight: 700;
-        text-align: center;
-        box-shadow: 0 0 30px rgba(5, 150, 105, 0.3);
-        border: 1px solid rgba(16, 185, 129, 0.3);
-    }
-    .signal-exit {
-        background: linear-gradient(135deg, #7f1d1d, #dc2626);
-        padding: 22px;
-        border-radius: 12px;
-        color: #fef2f2;
-        font-size: 26px;
-        font-weight: 700;
-        text-align: center;
-        box-shadow: 0 0 30px rgba(220, 38, 38, 0.3);
-        border: 1px solid rgba(248, 113, 113, 0.3);
-    }
-    .signal-neutral {
-        background: linear-gradient(135deg, #78350f, #d97706);
-        padding: 22px;
-        border-radius: 12px;
-        color: #fffbeb;
-        font-size: 26px;
-        font-weight: 700;
-        text-align: center;
-        box-shadow: 0 0 30px rgba(217, 119, 6, 0.3);
-        border: 1px solid rgba(251, 191, 36, 0.3);
-    }
-
-    /* ── Expiry Badge ────────────────────────────────────────── */
-    .expiry-badge {
-        background: rgba(59, 130, 246, 0.15);
-        color: #60a5fa;
-        padding: 6px 16px;
-        border-radius: 20px;
-        font-weight: 600;
-        border: 1px solid rgba(59, 130, 246, 0.3);
-    }
-
-    /* ── Cards / Containers ──────────────────────────────────── */
-    .stExpander {
-        background: rgba(30, 41, 59, 0.5) !important;
-        border: 1px solid rgba(100, 116, 139, 0.2) !important;
-        border-radius: 12px !important;
-    }
-
-    /* ── Metrics ─────────────────────────────────────────────── */
-    [data-testid="stMetricValue"] {
-        font-size: 28px !important;
-        font-weight: 700 !important;
-        color: #f1f5f9 !important;
-    }
-    [data-testid="stMetricDelta"] > div {
-        font-size: 14px !important;
-    }
-
-    /* ── Sidebar ─────────────────────────────────────────────── */
-    section[data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0f172a 0%, #1e293b 100%) !important;
-        border-right: 1px solid rgba(100, 116, 139, 0.2) !important;
-    }
-
-    /* ── Tabs ────────────────────────────────────────────────── */
-    .stTabs [data-baseweb="tab"] {
-        color: #94a3b8 !important;
-    }
-    .stTabs [aria-selected="true"] {
-        color: #60a5fa !important;
-        border-bottom-color: #3b82f6 !important;
-    }
-
-    /* ── Buttons ─────────────────────────────────────────────── */
-    .stButton > button {
-        background: rgba(30, 41, 59, 0.8) !important;
-        color: #e2e8f0 !important;
-        border: 1px solid rgba(100, 116, 139, 0.3) !important;
-        border-radius: 8px !important;
-        transition: all 0.2s ease !important;
-    }
-    .stButton > button:hover {
-        background: rgba(59, 130, 246, 0.2) !important;
-        border-color: #3b82f6 !important;
-        box-shadow: 0 0 15px rgba(59, 130, 246, 0.15) !important;
-    }
-
-    /* ── Dividers ─────────────────────────────────────────────── */
-    hr {
-        border-color: rgba(100, 116, 139, 0.2) !important;
-    }
-
-    /* ── Disclaimer bar ──────────────────────────────────────── */
-    .disclaimer {
-        background: rgba(30, 41, 59, 0.6);
-        border: 1px solid rgba(100, 116, 139, 0.15);
-        border-radius: 8px;
-        padding: 10px 16px;
-        text-align: center;
-        color: #64748b;
-        font-size: 12px;
-        margin-top: 40px;
-    }
-
-    /* ════════════════════════════════════════════════════════════
-       MOBILE RESPONSIVE — Tablets & below (≤768px)
-       ════════════════════════════════════════════════════════════ */
-    @media (max-width: 768px) {
-        /* ── Shrink header ─────────────────────────────────────── */
-        .main-header {
-            font-size: 26px !important;
-            margin-bottom: 2px !important;
-        }
-        .sub-header {
-            font-size: 11px !important;
-            letter-spacing: 1px !important;
-            margin-bottom: 16px !important;
-        }
-
-        /* ── Compact signal boxes ──────────────────────────────── */
-        .signal-strong-entry,
-        .signal-exit,
-        .signal-neutral {
-            font-size: 18px !important;
-            padding: 14px 12px !important;
-            border-radius: 8px !important;
-        }
-
-        /* ── Smaller metric values ─────────────────────────────── */
-        [data-testid="stMetricValue"] {
-            font-size: 20px !important;
-        }
-        [data-testid="stMetricLabel"] {
-            font-size: 11px !important;
-        }
-        [data-testid="stMetricDelta"] > div {
-            font-size: 11px !important;
-        }
-
-        /* ── Compact expiry buttons ────────────────────────────── */
-        .stButton > button {
-            padding: 6px 8px !important;
-            font-size: 11px !important;
-            min-height: 0 !important;
-        }
-        .stButton > button p {
-            font-size: 11px !important;
-            line-height: 1.3 !important;
-            margin: 0 !important;
-        }
-
-        /* ── Tighter containers ────────────────────────────────── */
-        .stExpander {
-            border-radius: 8px !important;
-        }
-        .stExpander summary {
-            font-size: 14px !important;
-        }
-
-        /* ── Reduce block padding ──────────────────────────────── */
-        .block-container {
-            padding-left: 12px !important;
-            padding-right: 12px !important;
-            padding-top: 16px !important;
-        }
-
-        /* ── Compact info/success/warning boxes ────────────────── */
-        .stAlert {
-            padding: 8px 12px !important;
-            font-size: 13px !important;
-        }
-
-        /* ── Compact disclaimer ────────────────────────────────── */
-        .disclaimer {
-            font-size: 10px !important;
-            padding: 8px 10px !important;
-            margin-top: 20px !important;
-        }
-
-        /* ── Chart height override ─────────────────────────────── */
-        [data-testid="stPlotlyChart"] {
-            max-height: 600px !important;
-        }
-        [data-testid="stPlotlyChart"] > div {
-            max-height: 600px !important;
-        }
-
-        /* ── Sidebar adjustments ───────────────────────────────── */
-        section[data-testid="stSidebar"] {
-            min-width: 200px !important;
-            max-width: 260px !important;
-        }
-        section[data-testid="stSidebar"] .block-container {
-            padding: 16px 12px !important;
-        }
-
-        /* ── Tabs compact ──────────────────────────────────────── */
-        .stTabs [data-baseweb="tab"] {
-            font-size: 13px !important;
-            padding: 8px 12px !important;
-        }
-    }
-
-    /* ════════════════════════════════════════════════════════════
-       SMALL MOBILE — Phones (≤480px)
-       ════════════════════════════════════════════════════════════ */
-    @media (max-width: 480px) {
-        .main-header {
-            font-size: 22px !important;
-        }
-        .sub-header {
-            font-size: 9px !important;
-            letter-spacing: 0.5px !important;
-            margin-bottom: 12px !important;
-        }
-
-        .signal-strong-entry,
-        .signal-exit,
-        .signal-neutral {
-            font-size: 16px !important;
-            padding: 10px 8px !important;
-        }
-
-        [data-testid="stMetricValue"] {
-            font-size: 18px !important;
-        }
-
-        .block-container {
-            padding-left: 8px !important;
-            padding-right: 8px !important;
-            padding-top: 10px !important;
-        }
-
-        /* ── Stack columns vertically with less gap ────────────── */
-        [data-testid="stHorizontalBlock"] {
-            gap: 4px !important;
-        }
-
-        .stButton > button {
-            padding: 4px 6px !important;
-            font-size: 10px !important;
-        }
-        .stButton > button p {
-            font-size: 10px !important;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Sidebar timeframe label → (yfinance period, interval)
+TIMEFRAMES = {
+    "Daily (5d)":   ("5d", "1d"),
+    "Hourly (5d)":  ("5d", "1h"),
+    "30 min (2d)":  ("2d", "30m"),
+    "15 min (1d)":  ("1d", "15m"),
+}
 
-def main():
-    display_header()
+# Short-leg delta tiers shown as setups and offered for paper trades
+SETUP_DELTAS = (0.16, 0.20, 0.30)
 
-    # ── Sidebar ────────────────────────────────────────────────────────────────
-    with st.sidebar:
-        st.header("⚙️ Controls")
-        data_source = st.radio("Data Source", ["Demo Mode", "Yahoo Finance (real)"], index=1)
-        timeframe_label = st.selectbox("Timeframe (for indicators)", [
-            "Daily (5d)", "Hourly (5d)", "30 min (2d)", "15 min (1d)"
-        ])
-        paper_enabled = st.checkbox("Enable Paper Trading", value=False)
-        show_chart = st.checkbox("Show Professional Chart", value=True)
-        auto_refresh = st.checkbox("Auto-refresh every 60s", value=False)
+# ── Cached data loaders ────────────────────────────────────────────────────
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_spy_data(period: str, interval: str) -> pd.DataFrame:
+    """SPY bars with indicators, fetched at most once a minute per timeframe"""
+    df = get_spy_data(period=period, interval=interval)
+    if not df.empty:
+        df = _cached_indicators(df)
+    return df
 
-        period, interval = {
-            "Daily (5d)":   ("5d", "1d"),
-            "Hourly (5d)":  ("5d", "1h"),
-            "30 min (2d)":  ("2d", "30m"),
-            "15 min (1d)":  ("1d", "15m"),
-        }[timeframe_label]
 
-        st.markdown("---")
-        st.caption("📊 SPY Iron Condor Pro v2.1")
-        st.caption("⚠️ Educational tool — not financial advice")
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
+def _cached_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Indicator columns, reused when a re-fetch returns the same bars"""
+    return calculate_indicators(df)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_options_chain(symbol: str):
+    """Yahoo options chain, shared across sessions and refreshed every 30s.
+
+    Returns (options_data, expirations, chain_version); expirations come
+    pre-sorted and the version changes only when the chain is actually
+    re-fetched, so downstream caches can key on it.
+    """
+    options_data = get_yahoo_options_chain(symbol)
+    return options_data, sorted(options_data or ()), time.time()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_demo_options():
+    """Demo options chain — only the DTE labels drift, so refresh rarely"""
+    options_data = generate_demo_options_data()
+    return options_data, sorted(options_data), time.time()
 
-    # ── Data loading ───────────────────────────────────────────────────────────
+
+@st.cache_resource(ttl=300, max_entries=4, show_spinner=False)
+def _cached_chain_index(_options_data, chain_version: float):
+    """Strike/delta arrays for every expiry, built once per chain refresh"""
+    return index_options_chain(_options_data)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_condors(_chain_index, chain_version: float, expiry: str, price: float, deltas: tuple):
+    """Iron condor setups for all delta tiers; the chain itself is not hashed"""
+    return find_iron_condor_strikes_indexed(_chain_index, expiry, price, deltas)
+
+
+def _load_market(period: str, interval: str, data_source: str, with_chain: bool = True):
+    """Price bars, spot and (optionally) the options chain for the active page
+
+    Returns (df, current_price, options_data, expirations, chain_version); the
+    chain fields are None when ``with_chain`` is False.
+    """
+    options_data = expirations = chain_version = None
     with st.spinner("Fetching market & options data..."):
-        df = get_spy_data(period=period, interval=interval)
+        # Price bars and the options chain are independent HTTP round-trips
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            price_future = pool.submit(_cached_spy_data, period, interval)
+            if not with_chain:
+                chain_future = None
+            elif data_source == "Yahoo Finance (real)":
+                chain_future = pool.submit(_cached_options_chain, "SPY")
+            else:
+                chain_future = pool.submit(_cached_demo_options)
+            df = price_future.result()
+            if chain_future is not None:
+                options_data, expirations, chain_version = chain_future.result()
+
         if df.empty:
             st.warning("No price data loaded — using fallback price")
             current_price = 580.0
         else:
-            df = calculate_indicators(df)
-            current_price = float(df['Close'].iloc[-1]) if not df.empty else 580.0
-
-        if data_source == "Yahoo Finance (real)":
-            options_data = get_yahoo_options_chain("SPY")
-        else:
-            options_data = generate_demo_options_data()
+            current_price = float(df['Close'].to_numpy()[-1])
 
-        if not options_data:
+        if with_chain and not options_data:
             st.warning("No options chain loaded — using demo chain")
-            options_data = generate_demo_options_data()
+            options_data, expirations, chain_version = _cached_demo_options()
+
+    return df, current_price, options_data, expirations, chain_version
 
-    expirations = sorted(options_data.keys())
-    selected_expiry = display_expiry_selector(expirations)
 
-    # ── Core analysis ──────────────────────────────────────────────────────────
-    entry_score, risk_score, signal = calculate_iron_condor_score(df, current_price)
+# ── Pages ──────────────────────────────────────────────────────────────────
+# Only the selected page's function runs, so e.g. the Signals page never
+# fetches or searches the options chain. Each is rendered as an st.fragment.
+def _signals_page(period: str, interval: str, data_source: str, show_chart: bool):
+    df, current_price, *_ = _load_market(period, interval, data_source, with_chain=False)
+
+    # Reuse the last score while the bar set is unchanged (cosmetic reruns)
+    score_key = (period, interval, len(df), df.index[-1] if len(df) else None, current_price)
+    cached_score = st.session_state.get("score_cache")
+    if cached_score and cached_score[0] == score_key:
+        entry_score, risk_score, signal = cached_score[1]
+    else:
+        entry_score, risk_score, signal = calculate_iron_condor_score(df, current_price)
+        st.session_state.score_cache = (score_key, (entry_score, risk_score, signal))
 
     display_current_metrics(df, current_price, entry_score, risk_score, signal)
     st.markdown("---")
@@ -364,50 +144,125 @@ def main():
 
     # ── Professional Chart ─────────────────────────────────────────────────────
     if show_chart and not df.empty:
-        display_professional_chart(df, current_price, entry_score, risk_score)
-        st.markdown("---")
+        _chart_panel(df, current_price, entry_score, risk_score, interval)
+
+
+def _setups_page(period: str, interval: str, data_source: str):
+    _, current_price, options_data, expirations, chain_version = _load_market(period, interval, data_source)
+    selected_expiry = display_expiry_selector(expirations)
+
+    chain_index = _cached_chain_index(options_data, chain_version)
+    _setups_panel(chain_index, chain_version, selected_expiry, current_price)
 
-    # ── Recommended Iron Condor setups ─────────────────────────────────────────
+
+def _paper_page(period: str, interval: str, data_source: str):
+    _, current_price, options_data, expirations, chain_version = _load_market(period, interval, data_source)
+    selected_expiry = display_expiry_selector(expirations)
+
+    chain_index = _cached_chain_index(options_data, chain_version)
+    _paper_panel(options_data, chain_index, chain_version, current_price, selected_expiry)
+
+
+# ── Independent sections ───────────────────────────────────────────────────
+# Each section is its own fragment so widget interaction inside one of them
+# (e.g. paper-trading buttons) reruns only that section.
+@st.fragment
+def _chart_panel(df: pd.DataFrame, current_price: float, entry_score: int, risk_score: int, interval: str):
+    # Imported on first use: plotly is only needed when the chart is shown
+    from ui.professional_chart import display_professional_chart
+    display_professional_chart(df, current_price, entry_score, risk_score, interval)
+
+
+@st.fragment
+def _setups_panel(chain_index, chain_version: float, selected_expiry: str, current_price: float):
     st.subheader("🎯 Recommended Iron Condor Setups")
-    col1, col2, col3 = st.columns(3)
+    columns = st.columns(3)
 
-    deltas = [0.16, 0.20, 0.30]
     labels = ["Conservative (16Δ)", "Balanced (20Δ) ⭐", "Aggressive (30Δ)"]
-    columns = [col1, col2, col3]
+    setups = _cached_condors(
+        chain_index, chain_version, selected_expiry, round(current_price, 2), SETUP_DELTAS
+    )
 
-    for col, delta, label in zip(columns, deltas, labels):
+    for col, delta, label, setup in zip(columns, SETUP_DELTAS, labels, setups):
         with col:
             with st.expander(label, expanded=(delta == 0.20)):
-                setup = find_iron_condor_strikes(
-                    options_data, selected_expiry, current_price, target_delta=delta
-                )
                 if setup:
                     st.metric("POP estimate", f"{setup['pop']}%")
                     st.metric("Max Profit", f"${setup['max_profit']:.2f}")
                     st.metric("Max Loss", f"${setup['max_loss']:.2f}")
+                    st.table(_setup_legs_table(setup))
+                else:
+                    st.info("No valid strikes found for this delta")
 
-                    st.markdown("**Call Spread**")
-                    st.write(f"Short: **{setup['short_call']['strike']}** @ {setup['short_call']['bid']:.2f}")
-                    st.write(f"Long:  {setup['long_call']['strike']} @ {setup['long_call']['ask']:.2f}")
 
-                    st.markdown("**Put Spread**")
-                    st.write(f"Short: **{setup['short_put']['strike']}** @ {setup['short_put']['bid']:.2f}")
-                    st.write(f"Long:  {setup['long_put']['strike']} @ {setup['long_put']['ask']:.2f}")
+def _setup_legs_table(setup: dict) -> pd.DataFrame:
+    """Legs + breakevens as one small table (one element instead of seven)"""
+    legs = [
+        ("Short Call", setup['short_call'], 'bid'),
+        ("Long Call",  setup['long_call'],  'ask'),
+        ("Short Put",  setup['short_put'],  'bid'),
+        ("Long Put",   setup['long_put'],   'ask'),
+    ]
+    rows = {label: (f"{opt['strike']:g}", f"{side} {opt[side]:.2f}") for label, opt, side in legs}
+    rows["Breakevens"] = (f"{setup['breakeven_lower']:.1f} – {setup['breakeven_upper']:.1f}", "")
+    return pd.DataFrame.from_dict(rows, orient="index", columns=["Strike", "Price"])
+
+
+@st.fragment
+def _paper_panel(options_data, chain_index, chain_version: float, current_price: float, selected_expiry: str):
+    # Imported on first use: only the Paper Trading page needs it
+    from ui.paper_trading_ui import display_paper_trading_panel
+
+    st.subheader("💼 Paper Trading")
+    # Same key as the Setups page → served from cache, no second strike search
+    ic_setups = _cached_condors(
+        chain_index, chain_version, selected_expiry, round(current_price, 2), SETUP_DELTAS
+    )
+    display_paper_trading_panel(
+        options_data=options_data,
+        current_price=current_price,
+        selected_expiry=selected_expiry,
+        setups=ic_setups
+    )
 
-                    st.info(f"Breakevens: {setup['breakeven_lower']:.1f} – {setup['breakeven_upper']:.1f}")
-                else:
-                    st.info("No valid strikes found for this delta")
 
-    st.markdown("---")
+def main():
+    inject_theme_css()
+    display_header()
 
-    # ── Paper Trading ──────────────────────────────────────────────────────────
-    if paper_enabled:
-        st.subheader("💼 Paper Trading")
-        display_paper_trading_panel(
-            options_data=options_data,
-            current_price=current_price,
-            selected_expiry=selected_expiry
-        )
+    # ── Sidebar ────────────────────────────────────────────────────────────────
+    with st.sidebar:
+        st.header("⚙️ Controls")
+        data_source = st.radio("Data Source", ["Demo Mode", "Yahoo Finance (real)"], index=1)
+        timeframe_label = st.selectbox("Timeframe (for indicators)", list(TIMEFRAMES))
+        show_chart = st.checkbox("Show Professional Chart", value=True)
+        auto_refresh = st.checkbox("Auto-refresh every 60s", value=False)
+
+        period, interval = TIMEFRAMES[timeframe_label]
+
+        st.markdown("---")
+        st.caption("📊 SPY Iron Condor Pro v2.1")
+        st.caption("⚠️ Educational tool — not financial advice")
+
+    # ── Pages ──────────────────────────────────────────────────────────────────
+    # Only the active page re-executes on the auto-refresh tick; the CSS, header
+    # and sidebar are left untouched and no worker thread sleeps in between.
+    run_every = 60 if auto_refresh else None
+
+    def signals():
+        st.fragment(_signals_page, run_every=run_every)(period, interval, data_source, show_chart)
+
+    def setups():
+        st.fragment(_setups_page, run_every=run_every)(period, interval, data_source)
+
+    def paper_trading():
+        st.fragment(_paper_page, run_every=run_every)(period, interval, data_source)
+
+    st.navigation([
+        st.Page(signals, title="Signals", icon="📈", default=True),
+        st.Page(setups, title="Setups", icon="🎯"),
+        st.Page(paper_trading, title="Paper Trading", icon="💼"),
+    ]).run()
 
     # ── Footer ─────────────────────────────────────────────────────────────────
     st.markdown(
@@ -418,11 +273,5 @@ def main():
         unsafe_allow_html=True
     )
 
-    # ── Auto-refresh ───────────────────────────────────────────────────────────
-    if auto_refresh:
-        time.sleep(60)
-        st.rerun()
-
 if __name__ == "__main__":
-    initialize_paper_trading()
     main()
@@ -1,43 +1,106 @@
-import pandas as pd
 import numpy as np
+from scipy.signal import lfilter
+
+
+def df_fingerprint(df):
+    # Cheap identity for a bar set (length, last timestamp, last close) — used as
+    # the st.cache_data hash for DataFrames instead of hashing every cell
+    if df.empty:
+        return (0, None, None)
+    return (len(df), str(df.index[-1]), float(df['Close'].iat[-1]))
+
+def sma(values, window):
+    # Trailing simple moving average via a cumulative-sum difference (O(n), one
+    # pass); the first window-1 bars average what is available, like pandas
+    # rolling(window, min_periods=1).mean()
+    values = np.asarray(values, dtype=float)
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (csum[ends] - csum[starts]) / (ends - starts)
+
+def rolling_std(values, window):
+    # Trailing sample standard deviation (ddof=1) from running sums of x and
+    # x²; NaN while only one bar is in the window, like pandas
+    # rolling(window, min_periods=1).std(). Values are centred first so the
+    # sums stay small and the subtraction does not lose precision.
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+    x = values - values.mean()
+    csum = np.cumsum(np.insert(x, 0, 0.0))
+    csq = np.cumsum(np.insert(x * x, 0, 0.0))
+    ends = np.arange(1, len(x) + 1)
+    starts = np.maximum(ends - window, 0)
+    n = ends - starts
+    s = csum[ends] - csum[starts]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (csq[ends] - csq[starts] - s * s / n) / (n - 1)
+    return np.sqrt(np.maximum(var, 0.0))
+
+def ema(values, span):
+    # Recursive EMA, y[i] = k*x[i] + (1-k)*y[i-1] seeded with x[0] — the same
+    # as pandas ewm(span, adjust=False).mean() — run as one C-level IIR pass
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+    k = 2.0 / (span + 1)
+    out, _ = lfilter([k], [1.0, k - 1.0], values, zi=[(1.0 - k) * values[0]])
+    return out
+
+def rsi(close, window=14):
+    # Simple-average RSI from one diff and two running-sum means; bars with no
+    # losses in the window read 0 (rs treated as 0), as before
+    close = np.asarray(close, dtype=float)
+    delta = np.diff(close, prepend=close[:1])
+    gain = sma(np.maximum(delta, 0.0), window)
+    loss = sma(np.maximum(-delta, 0.0), window)
+    rs = np.divide(gain, loss, out=np.zeros_like(gain), where=loss > 0)
+    return np.clip(100 - 100 / (1 + rs), 0, 100)
 
 def calculate_indicators(df):
     if len(df) < 5:
         return df
 
-    # Bollinger Bands
-    df['SMA20'] = df['Close'].rolling(20, min_periods=1).mean()
-    df['BB_std'] = df['Close'].rolling(20, min_periods=1).std()
-    df['BB_upper'] = df['SMA20'] + df['BB_std'] * 2
-    df['BB_lower'] = df['SMA20'] - df['BB_std'] * 2
-    df['BB_width'] = (df['BB_upper'] - df['BB_lower']) / df['SMA20'] * 100
+    close = df['Close'].to_numpy(dtype=float)
+
+    # Bollinger Bands — running-sum mean/std over the raw Close array
+    sma20 = sma(close, 20)
+    bb_std = rolling_std(close, 20)
+    bb_upper = sma20 + bb_std * 2
+    bb_lower = sma20 - bb_std * 2
+    bb_width = (bb_std * 4) / sma20 * 100
+    # A single bar has no spread: the first row takes the second's bands
+    for band in (bb_std, bb_upper, bb_lower, bb_width):
+        band[0] = band[1]
+    df['SMA20'] = sma20
+    df['BB_std'] = bb_std
+    df['BB_upper'] = bb_upper
+    df['BB_lower'] = bb_lower
+    df['BB_width'] = bb_width
 
     # RSI
-    delta = df['Close'].diff()
-    gain = delta.where(delta > 0, 0).rolling(14, min_periods=1).mean()
-    loss = -delta.where(delta < 0, 0).rolling(14, min_periods=1).mean()
-    rs = gain / loss.replace(0, np.nan)
-    rs = rs.fillna(0)
-    df['RSI'] = 100 - (100 / (1 + rs))
-    df['RSI'] = df['RSI'].clip(0, 100).fillna(50)
+    df['RSI'] = rsi(close, 14)
 
     # MACD (12/26/9)
-    ema12 = df['Close'].ewm(span=12, adjust=False, min_periods=1).mean()
-    ema26 = df['Close'].ewm(span=26, adjust=False, min_periods=1).mean()
-    df['MACD'] = ema12 - ema26
-    df['MACD_signal'] = df['MACD'].ewm(span=9, adjust=False, min_periods=1).mean()
-    df['MACD_hist'] = df['MACD'] - df['MACD_signal']
+    macd = ema(close, 12) - ema(close, 26)
+    macd_signal = ema(macd, 9)
+    df['MACD'] = macd
+    df['MACD_signal'] = macd_signal
+    df['MACD_hist'] = macd - macd_signal
 
     # ATR (14-period) & ATR %
-    high_low = df['High'] - df['Low']
-    high_close = (df['High'] - df['Close'].shift()).abs()
-    low_close = (df['Low'] - df['Close'].shift()).abs()
-    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    df['ATR'] = true_range.rolling(14, min_periods=1).mean()
-    df['ATR_pct'] = (df['ATR'] / df['Close']) * 100
-
-    # Fill NaNs safely
-    df = df.bfill().ffill().fillna(0)
+    high = df['High'].to_numpy(dtype=float)
+    low = df['Low'].to_numpy(dtype=float)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    # fmax skips the missing previous close on the first bar
+    true_range = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    atr = sma(true_range, 14)
+    df['ATR'] = atr
+    df['ATR_pct'] = (atr / close) * 100
+
+    # Volume MA (20) — memoized with the rest of the frame, read by the chart
+    df['Vol_MA20'] = sma(df['Volume'].to_numpy(), 20)
 
     return df
 
@@ -93,56 +156,122 @@ def calculate_iron_condor_score(df, current_price):
 
 
 def find_iron_condor_strikes(options_data, expiration, current_price, target_delta=0.20):
+    return find_iron_condor_strikes_batch(options_data, expiration, current_price, (target_delta,))[0]
+
+
+def find_iron_condor_strikes_batch(options_data, expiration, current_price, target_deltas=(0.16, 0.20, 0.30)):
     if expiration not in options_data:
-        return None
+        return [None] * len(target_deltas)
+    chain_index = {expiration: _index_expiry(options_data[expiration])}
+    return find_iron_condor_strikes_indexed(chain_index, expiration, current_price, target_deltas)
 
-    opts = options_data[expiration]
-    calls = [o for o in opts if o['type'] == 'call' and o['strike'] > current_price]
-    puts  = [o for o in opts if o['type'] == 'put'  and o['strike'] < current_price]
 
-    if not calls or not puts:
-        return None
+def index_options_chain(options_data):
+    # Strike-sorted NumPy views of every expiry; build once per chain refresh
+    return {exp: _index_expiry(opts) for exp, opts in options_data.items()}
+
 
-    calls = sorted(calls, key=lambda x: x['strike'])
-    puts  = sorted(puts,  key=lambda x: x['strike'], reverse=True)
+def _index_expiry(opts):
+    calls = sorted((o for o in opts if o['type'] == 'call'), key=lambda x: x['strike'])
+    puts  = sorted((o for o in opts if o['type'] == 'put'),  key=lambda x: -x['strike'])
+    return {
+        'calls': calls,
+        'puts': puts,
+        'call_strikes': np.array([c['strike'] for c in calls], dtype=float),
+        'put_strikes':  np.array([p['strike'] for p in puts],  dtype=float),
+        'call_abs_delta': np.abs(np.array([c.get('greeks', {}).get('delta', 0) for c in calls], dtype=float)),
+        'put_abs_delta':  np.abs(np.array([p.get('greeks', {}).get('delta', 0) for p in puts],  dtype=float)),
+        # POP assumes 0.3 for a short leg without Greeks, not the 0 used for picking
+        'call_pop_delta': np.abs(np.array([c.get('greeks', {}).get('delta', 0.3) for c in calls], dtype=float)),
+        'put_pop_delta':  np.abs(np.array([p.get('greeks', {}).get('delta', 0.3) for p in puts],  dtype=float)),
+        'call_bid': np.array([c['bid'] for c in calls], dtype=float),
+        'call_ask': np.array([c['ask'] for c in calls], dtype=float),
+        'put_bid':  np.array([p['bid'] for p in puts],  dtype=float),
+        'put_ask':  np.array([p['ask'] for p in puts],  dtype=float),
+    }
 
-    def closest_delta(items, target):
-        if not items: return None
-        return min(items, key=lambda x: abs(abs(x.get('greeks', {}).get('delta', 0)) - target))
 
-    short_call = closest_delta(calls, target_delta)
-    short_put  = closest_delta(puts,  target_delta)
+def find_iron_condor_strikes_indexed(chain_index, expiration, current_price, target_deltas=(0.16, 0.20, 0.30)):
+    if expiration not in chain_index:
+        return [None] * len(target_deltas)
 
-    if not short_call or not short_put:
-        return None
+    ix = chain_index[expiration]
+    # OTM slices: calls ascending above spot, puts descending below spot
+    c0 = np.searchsorted(ix['call_strikes'], current_price, side='right')
+    p0 = np.searchsorted(-ix['put_strikes'], -current_price, side='right')
+    calls, puts = ix['calls'][c0:], ix['puts'][p0:]
+
+    setups = [None] * len(target_deltas)
+    if not calls or not puts:
+        return setups
+
+    call_strikes, call_abs_delta = ix['call_strikes'][c0:], ix['call_abs_delta'][c0:]
+    put_strikes,  put_abs_delta  = ix['put_strikes'][p0:],  ix['put_abs_delta'][p0:]
+
+    sc, lc, sp, lp = pick_condor_legs(
+        call_strikes, call_abs_delta, put_strikes, put_abs_delta,
+        np.asarray(target_deltas, dtype=float)
+    )
+
+    # Drop targets whose short strike has no wing further out
+    ok = (lc < len(calls)) & (lp < len(puts))
+    if not ok.any():
+        return setups
+    sc, lc, sp, lp = sc[ok], lc[ok], sp[ok], lp[ok]
+
+    payoff = condor_payoffs(
+        call_strikes[sc], call_strikes[lc], put_strikes[sp], put_strikes[lp],
+        ix['call_bid'][c0:][sc], ix['call_ask'][c0:][lc],
+        ix['put_bid'][p0:][sp],  ix['put_ask'][p0:][lp],
+        ix['call_pop_delta'][c0:][sc], ix['put_pop_delta'][p0:][sp],
+    )
+
+    for j, i in enumerate(np.flatnonzero(ok)):
+        setups[i] = {
+            'short_call': calls[sc[j]],
+            'long_call': calls[lc[j]],
+            'short_put': puts[sp[j]],
+            'long_put': puts[lp[j]],
+            **{key: values[j] for key, values in payoff.items()},
+        }
+    return setups
+
+
+def pick_condor_legs(call_strikes, call_abs_delta, put_strikes, put_abs_delta, targets):
+    # Pure-array kernel: calls ascending, puts descending, both OTM.
+    # Returns leg indices per target; a long index == len(side) means no wing.
+    # (n_targets, n_strikes) distance matrices → closest strike per target
+    short_call_idx = np.abs(call_abs_delta - targets[:, None]).argmin(axis=1)
+    short_put_idx  = np.abs(put_abs_delta  - targets[:, None]).argmin(axis=1)
 
     # Long legs (next strike out)
-    long_call = next((c for c in calls if c['strike'] > short_call['strike']), None)
-    long_put  = next((p for p in puts  if p['strike'] < short_put['strike']),  None)
+    long_call_idx = np.searchsorted(call_strikes, call_strikes[short_call_idx], side='right')
+    long_put_idx  = np.searchsorted(-put_strikes, -put_strikes[short_put_idx],  side='right')
+
+    return short_call_idx, long_call_idx, short_put_idx, long_put_idx
 
-    if not long_call or not long_put:
-        return None
 
-    credit = (short_call['bid'] + short_put['bid'] - long_call['ask'] - long_put['ask']) * 100
-    width = max(long_call['strike'] - short_call['strike'], short_put['strike'] - long_put['strike'])
+def condor_payoffs(short_call_k, long_call_k, short_put_k, long_put_k,
+                   short_call_bid, long_call_ask, short_put_bid, long_put_ask,
+                   short_call_abs_delta, short_put_abs_delta):
+    # Payoff math for N condors at once (arrays of equal length, per-share prices)
+    credit = (short_call_bid + short_put_bid - long_call_ask - long_put_ask) * 100
+    width = np.maximum(long_call_k - short_call_k, short_put_k - long_put_k)
     max_loss = width * 100 - credit
 
-    pop = round((1 - abs(short_call.get('greeks', {}).get('delta', 0.3))
-                   - abs(short_put.get('greeks', {}).get('delta', 0.3))) * 100, 1)
+    pop = (1 - short_call_abs_delta - short_put_abs_delta) * 100
 
     # Breakeven calculations
     credit_per_share = credit / 100
-    breakeven_upper = short_call['strike'] + credit_per_share
-    breakeven_lower = short_put['strike'] - credit_per_share
+    breakeven_upper = short_call_k + credit_per_share
+    breakeven_lower = short_put_k - credit_per_share
 
     return {
-        'short_call': short_call,
-        'long_call': long_call,
-        'short_put': short_put,
-        'long_put': long_put,
-        'max_profit': max(credit, 0),
-        'max_loss': max(max_loss, 0),
-        'pop': pop,
-        'breakeven_upper': round(breakeven_upper, 2),
-        'breakeven_lower': round(breakeven_lower, 2),
+        'max_profit': np.maximum(credit, 0).tolist(),
+        'max_loss': np.maximum(max_loss, 0).tolist(),
+        # Python round() per element: np.round can land one step lower on
+        # values that sit at a binary half, changing the displayed figure
+        'pop': [round(v, 1) for v in pop.tolist()],
+        'breakeven_upper': [round(v, 2) for v in breakeven_upper.tolist()],
+        'breakeven_lower': [round(v, 2) for v in breakeven_lower.tolist()],
     }
@@ -1,13 +1,16 @@
 # src/data.py
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from pathlib import Path
 
-from src.greeks import (
-    calculate_delta, calculate_gamma, calculate_theta,
-    calculate_vega, calculate_rho
-)
+from src.greeks import compute_greeks_vec
 
 def get_spy_data(period="5d", interval="1d"):
     try:
@@ -32,7 +35,112 @@ def generate_demo_price_data():
     }, index=dates)
 
 
+# On-disk copy of the last good chain, so a restarted process (or a burst of
+# cold sessions) does not re-hit Yahoo for a chain that is only seconds old
+CHAIN_SNAPSHOT_DIR = Path(tempfile.gettempdir()) / "spy_ic_cache"
+CHAIN_SNAPSHOT_MAX_AGE = 30  # seconds
+
+
+def _chain_snapshot_path(symbol):
+    return CHAIN_SNAPSHOT_DIR / f"{symbol}_options.json"
+
+
+def _read_chain_snapshot(symbol, max_age=CHAIN_SNAPSHOT_MAX_AGE):
+    path = _chain_snapshot_path(symbol)
+    try:
+        if time.time() - path.stat().st_mtime > max_age:
+            return None
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_chain_snapshot(symbol, options_data):
+    path = _chain_snapshot_path(symbol)
+    tmp = None
+    try:
+        payload = json.dumps(options_data, default=float)
+        CHAIN_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        # Unique temp file per write: concurrent writers never share one
+        with tempfile.NamedTemporaryFile("w", dir=CHAIN_SNAPSHOT_DIR, suffix=".tmp", delete=False) as f:
+            tmp = f.name
+            f.write(payload)
+        os.replace(tmp, path)  # atomic, readers never see a half-written file
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Options snapshot write failed: {e}")
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _column(df, name, default):
+    # Column as an ndarray with missing values (or a missing column) → default
+    if name in df:
+        return df[name].fillna(default).to_numpy()
+    return np.full(len(df), default)
+
+
+def days_to_expiry(expirations, today=None):
+    # Calendar days to each 'YYYY-MM-DD' expiration (min 1) — the one DTE
+    # definition shared by the Greeks and the expiry selector labels
+    today = today or date.today()
+    return {exp: max(1, (date.fromisoformat(exp) - today).days) for exp in expirations}
+
+
+def _fetch_expiry(ticker, exp_date, dte, current_price):
+    """Option list (calls then puts, with Greeks) for one expiration"""
+    opt_chain = ticker.option_chain(exp_date)
+    calls = opt_chain.calls
+    puts  = opt_chain.puts
+
+    opts = []
+
+    for side, df_side in [('call', calls), ('put', puts)]:
+        # Whole columns up front — no per-row Series boxing
+        strikes = df_side['strike'].to_numpy(dtype=float)
+        ivs = _column(df_side, 'impliedVolatility', 0.20).astype(float)
+        bids = _column(df_side, 'bid', 0)
+        asks = _column(df_side, 'ask', 0)
+        lasts = _column(df_side, 'lastPrice', 0)
+        volumes = _column(df_side, 'volume', 0).astype(np.int64)
+        open_interest = _column(df_side, 'openInterest', 0).astype(np.int64)
+
+        # Greeks for the whole side in one vectorized pass, rounded once
+        greeks = [np.round(g, 4) for g in compute_greeks_vec(current_price, strikes, dte, ivs, side)]
+
+        rows = zip(strikes.tolist(), bids.tolist(), asks.tolist(), lasts.tolist(),
+                   volumes.tolist(), open_interest.tolist(), np.round(ivs, 4).tolist(),
+                   *(g.tolist() for g in greeks))
+        for strike, bid, ask, last, volume, oi, iv, delta, gamma, theta, vega, rho in rows:
+            opts.append({
+                'strike': strike,
+                'type': side,
+                'expiration_date': exp_date,
+                'bid': bid,
+                'ask': ask,
+                'last': last,
+                'volume': volume,
+                'open_interest': oi,
+                'greeks': {
+                    'delta': delta,
+                    'gamma': gamma,
+                    'theta': theta,
+                    'vega':  vega,
+                    'rho':   rho
+                },
+                'iv': iv
+            })
+
+    return opts
+
+
 def get_yahoo_options_chain(symbol="SPY"):
+    snapshot = _read_chain_snapshot(symbol)
+    if snapshot:
+        return snapshot
+
     try:
         ticker = yf.Ticker(symbol)
         expirations = ticker.options[:12]  # limit to avoid rate-limiting
@@ -40,48 +148,15 @@ def get_yahoo_options_chain(symbol="SPY"):
             return None
 
         current_price = ticker.history(period="1d")['Close'].iloc[-1]
-        options_data = {}
-
-        for exp_date in expirations:
-            opt_chain = ticker.option_chain(exp_date)
-            calls = opt_chain.calls
-            puts  = opt_chain.puts
-
-            opts = []
-            dte = max(1, (datetime.strptime(exp_date, '%Y-%m-%d') - datetime.now()).days)
-
-            for side, df_side in [('call', calls), ('put', puts)]:
-                for _, row in df_side.iterrows():
-                    strike = row['strike']
-                    iv = row.get('impliedVolatility', 0.20)
-
-                    delta = calculate_delta(current_price, strike, dte, iv, side)
-                    gamma = calculate_gamma(current_price, strike, dte, iv)
-                    theta = calculate_theta(current_price, strike, dte, iv, side)
-                    vega  = calculate_vega(current_price, strike, dte, iv)
-                    rho   = calculate_rho(current_price, strike, dte, iv, side)
-
-                    opts.append({
-                        'strike': strike,
-                        'type': side,
-                        'expiration_date': exp_date,
-                        'bid': row.get('bid', 0),
-                        'ask': row.get('ask', 0),
-                        'last': row.get('lastPrice', 0),
-                        'volume': int(row.get('volume', 0)) if pd.notna(row.get('volume')) else 0,
-                        'open_interest': int(row.get('openInterest', 0)) if pd.notna(row.get('openInterest')) else 0,
-                        'greeks': {
-                            'delta': round(delta, 4),
-                            'gamma': round(gamma, 4),
-                            'theta': round(theta, 4),
-                            'vega':  round(vega,  4),
-                            'rho':   round(rho,   4)
-                        },
-                        'iv': round(iv, 4)
-                    })
-
-            options_data[exp_date] = opts
+        dte_by_exp = days_to_expiry(expirations)
+
+        # Each expiry is its own blocking HTTP round-trip — overlap them
+        # (kept small to stay clear of Yahoo's rate limiting)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            chains = pool.map(lambda exp: _fetch_expiry(ticker, exp, dte_by_exp[exp], current_price), expirations)
+            options_data = dict(zip(expirations, chains))
 
+        _write_chain_snapshot(symbol, options_data)
         return options_data
 
     except Exception as e:
@@ -92,57 +167,49 @@ def get_yahoo_options_chain(symbol="SPY"):
 def generate_demo_options_data():
     """Generate realistic demo options data with proper calls AND puts at each strike"""
     current_price = 580.0
-    expirations = [(datetime.now() + timedelta(days=d)).strftime('%Y-%m-%d') for d in [7, 14, 21, 30, 45, 60]]
+    now = datetime.now()
+    expirations = [(now + timedelta(days=d)).strftime('%Y-%m-%d') for d in [7, 14, 21, 30, 45, 60]]
+    dte_by_exp = days_to_expiry(expirations, now.date())
     data = {}
 
     for exp in expirations:
-        dte = max(1, (datetime.strptime(exp, '%Y-%m-%d') - datetime.now()).days)
+        dte = dte_by_exp[exp]
         opts = []
 
-        for strike in np.arange(current_price - 40, current_price + 45, 5):
-            iv = 0.18 + abs(strike - current_price) / current_price * 0.4
-
-            # Generate CALL
-            call_delta = calculate_delta(current_price, strike, dte, iv, 'call')
-            call_theta = calculate_theta(current_price, strike, dte, iv, 'call')
-            call_intrinsic = max(0, current_price - strike)
-            call_price = max(0.05, call_intrinsic + iv * np.sqrt(dte / 365) * current_price * 0.1)
-            opts.append({
-                'strike': strike,
-                'type': 'call',
-                'expiration_date': exp,
-                'bid': round(max(0.05, call_price - 0.03), 2),
-                'ask': round(max(0.10, call_price + 0.03), 2),
-                'greeks': {
-                    'delta': round(call_delta, 4),
-                    'gamma': round(calculate_gamma(current_price, strike, dte, iv), 4),
-                    'theta': round(call_theta, 4),
-                    'vega': round(calculate_vega(current_price, strike, dte, iv), 4),
-                    'rho': round(calculate_rho(current_price, strike, dte, iv, 'call'), 4),
-                },
-                'iv': round(iv, 4)
-            })
-
-            # Generate PUT
-            put_delta = calculate_delta(current_price, strike, dte, iv, 'put')
-            put_theta = calculate_theta(current_price, strike, dte, iv, 'put')
-            put_intrinsic = max(0, strike - current_price)
-            put_price = max(0.05, put_intrinsic + iv * np.sqrt(dte / 365) * current_price * 0.1)
-            opts.append({
-                'strike': strike,
-                'type': 'put',
-                'expiration_date': exp,
-                'bid': round(max(0.05, put_price - 0.03), 2),
-                'ask': round(max(0.10, put_price + 0.03), 2),
-                'greeks': {
-                    'delta': round(put_delta, 4),
-                    'gamma': round(calculate_gamma(current_price, strike, dte, iv), 4),
-                    'theta': round(put_theta, 4),
-                    'vega': round(calculate_vega(current_price, strike, dte, iv), 4),
-                    'rho': round(calculate_rho(current_price, strike, dte, iv, 'put'), 4),
-                },
-                'iv': round(iv, 4)
-            })
+        # Whole strike ladder at once: IV smile, premiums and Greeks as arrays
+        strikes = np.arange(current_price - 40, current_price + 45, 5)
+        ivs = 0.18 + np.abs(strikes - current_price) / current_price * 0.4
+        time_value = ivs * np.sqrt(dte / 365) * current_price * 0.1
+        rounded_ivs = np.round(ivs, 4).tolist()
+
+        sides = {}
+        for side, intrinsic in (('call', current_price - strikes), ('put', strikes - current_price)):
+            prices = np.maximum(0.05, np.maximum(0, intrinsic) + time_value)
+            # Everything rounded once per array, then unboxed to plain floats
+            sides[side] = (
+                np.round(np.maximum(0.05, prices - 0.03), 2).tolist(),
+                np.round(np.maximum(0.10, prices + 0.03), 2).tolist(),
+                [np.round(g, 4).tolist() for g in compute_greeks_vec(current_price, strikes, dte, ivs, side)],
+            )
+
+        # Call and put at each strike, in strike order
+        for i, strike in enumerate(strikes.tolist()):
+            for side, (bids, asks, (delta, gamma, theta, vega, rho)) in sides.items():
+                opts.append({
+                    'strike': strike,
+                    'type': side,
+                    'expiration_date': exp,
+                    'bid': bids[i],
+                    'ask': asks[i],
+                    'greeks': {
+                        'delta': delta[i],
+                        'gamma': gamma[i],
+                        'theta': theta[i],
+                        'vega': vega[i],
+                        'rho': rho[i],
+                    },
+                    'iv': rounded_ivs[i]
+                })
 
         data[exp] = opts
     return data
@@ -1,10 +1,30 @@
 # src/greeks.py
-from math import log, sqrt, exp, pi
-from scipy.stats import norm
+from math import log, sqrt, exp, pi, erf
+from scipy.special import ndtr
 import numpy as np
 
 RISK_FREE_RATE = 0.045  # Approximate 2026 short-term risk-free rate
 
+_RSQRT2 = 1 / sqrt(2)
+_RSQRT2PI = 1 / sqrt(2 * pi)
+
+
+def _norm_cdf(x: float) -> float:
+    # Standard normal CDF on a plain float (math.erf, no scipy dispatch)
+    return 0.5 * (1.0 + erf(x * _RSQRT2))
+
+
+def _norm_pdf(x: float) -> float:
+    return _RSQRT2PI * exp(-0.5 * x * x)
+
+
+def _bs_core(S: float, K: float, T: float, sigma: float):
+    # Terms every Greek shares: (d1, d2, sqrt(t), discount factor, t in years)
+    t = T / 365
+    sqrt_t = sqrt(t)
+    d1 = (log(S / K) + (RISK_FREE_RATE + 0.5 * sigma**2) * t) / (sigma * sqrt_t)
+    return d1, d1 - sigma * sqrt_t, sqrt_t, exp(-RISK_FREE_RATE * t), t
+
 
 def calculate_delta(S: float, K: float, T: float, sigma: float, option_type: str = 'call') -> float:
     """Delta: Rate of change of option price with respect to underlying price"""
@@ -15,12 +35,11 @@ def calculate_delta(S: float, K: float, T: float, sigma: float, option_type: str
             return -1.0 if S < K else 0.0
 
     try:
-        r = RISK_FREE_RATE
-        d1 = (log(S / K) + (r + 0.5 * sigma**2) * (T / 365)) / (sigma * sqrt(T / 365))
+        d1, *_ = _bs_core(S, K, T, sigma)
         if option_type == 'call':
-            return norm.cdf(d1)
+            return _norm_cdf(d1)
         else:
-            return norm.cdf(d1) - 1
+            return _norm_cdf(d1) - 1
     except (ValueError, ZeroDivisionError, OverflowError):
         return 0.5 if option_type == 'call' else -0.5
 
@@ -31,9 +50,8 @@ def calculate_gamma(S: float, K: float, T: float, sigma: float) -> float:
         return 0.0
 
     try:
-        r = RISK_FREE_RATE
-        d1 = (log(S / K) + (r + 0.5 * sigma**2) * (T / 365)) / (sigma * sqrt(T / 365))
-        return norm.pdf(d1) / (S * sigma * sqrt(T / 365))
+        d1, _, sqrt_t, _, _ = _bs_core(S, K, T, sigma)
+        return _norm_pdf(d1) / (S * sigma * sqrt_t)
     except (ValueError, ZeroDivisionError, OverflowError):
         return 0.01
 
@@ -45,18 +63,17 @@ def calculate_theta(S: float, K: float, T: float, sigma: float, option_type: str
 
     try:
         r = RISK_FREE_RATE
-        d1 = (log(S / K) + (r + 0.5 * sigma**2) * (T / 365)) / (sigma * sqrt(T / 365))
-        d2 = d1 - sigma * sqrt(T / 365)
+        d1, d2, sqrt_t, discount, _ = _bs_core(S, K, T, sigma)
 
         if option_type == 'call':
             theta = (
-                -S * norm.pdf(d1) * sigma / (2 * sqrt(T / 365)) -
-                r * K * exp(-r * T / 365) * norm.cdf(d2)
+                -S * _norm_pdf(d1) * sigma / (2 * sqrt_t) -
+                r * K * discount * _norm_cdf(d2)
             )
         else:
             theta = (
-                -S * norm.pdf(d1) * sigma / (2 * sqrt(T / 365)) +
-                r * K * exp(-r * T / 365) * norm.cdf(-d2)
+                -S * _norm_pdf(d1) * sigma / (2 * sqrt_t) +
+                r * K * discount * _norm_cdf(-d2)
             )
 
         return theta / 365  # Per day
@@ -70,9 +87,8 @@ def calculate_vega(S: float, K: float, T: float, sigma: float) -> float:
         return 0.0
 
     try:
-        r = RISK_FREE_RATE
-        d1 = (log(S / K) + (r + 0.5 * sigma**2) * (T / 365)) / (sigma * sqrt(T / 365))
-        return S * norm.pdf(d1) * sqrt(T / 365) / 100  # Per 1% change
+        d1, _, sqrt_t, _, _ = _bs_core(S, K, T, sigma)
+        return S * _norm_pdf(d1) * sqrt_t / 100  # Per 1% change
     except (ValueError, ZeroDivisionError, OverflowError):
         return 0.15
 
@@ -83,13 +99,60 @@ def calculate_rho(S: float, K: float, T: float, sigma: float, option_type: str =
         return 0.0
 
     try:
-        r = RISK_FREE_RATE
-        d1 = (log(S / K) + (r + 0.5 * sigma**2) * (T / 365)) / (sigma * sqrt(T / 365))
-        d2 = d1 - sigma * sqrt(T / 365)
+        _, d2, _, discount, t = _bs_core(S, K, T, sigma)
 
         if option_type == 'call':
-            return K * (T / 365) * exp(-r * T / 365) * norm.cdf(d2) / 100
+            return K * t * discount * _norm_cdf(d2) / 100
         else:
-            return -K * (T / 365) * exp(-r * T / 365) * norm.cdf(-d2) / 100
+            return -K * t * discount * _norm_cdf(-d2) / 100
     except (ValueError, ZeroDivisionError, OverflowError):
         return 0.01
+
+
+def compute_greeks_vec(S: float, K, T: float, sigma, option_type: str = 'call'):
+    """All five Greeks for a strip of strikes at one expiry, as arrays
+
+    Same conventions and fallbacks as the scalar functions above, but d1/d2
+    are computed once for the whole strip and the normal CDF runs as one
+    vectorized ``ndtr`` pass. Returns (delta, gamma, theta, vega, rho).
+    """
+    K = np.asarray(K, dtype=float)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float), K.shape)
+    is_call = option_type == 'call'
+
+    if T <= 0:
+        delta = np.where(S > K, 1.0, 0.0) if is_call else np.where(S < K, -1.0, 0.0)
+        return delta, np.zeros_like(K), np.zeros_like(K), np.zeros_like(K), np.zeros_like(K)
+
+    r = RISK_FREE_RATE
+    t = T / 365
+    sqrt_t = sqrt(t)
+    discount = exp(-r * t)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * t) / (sigma * sqrt_t)
+        d2 = d1 - sigma * sqrt_t
+        pdf_d1 = np.exp(-0.5 * d1 * d1) / sqrt(2 * pi)
+        gamma = pdf_d1 / (S * sigma * sqrt_t)
+    vega = S * pdf_d1 * sqrt_t / 100
+    decay = -S * pdf_d1 * sigma / (2 * sqrt_t)
+
+    if is_call:
+        delta = ndtr(d1)
+        theta = (decay - r * K * discount * ndtr(d2)) / 365
+        rho = K * t * discount * ndtr(d2) / 100
+    else:
+        delta = ndtr(d1) - 1
+        theta = (decay + r * K * discount * ndtr(-d2)) / 365
+        rho = -K * t * discount * ndtr(-d2) / 100
+
+    # Strikes the scalar versions reject (zero IV, non-positive strike)
+    bad = (sigma == 0) | (K <= 0)
+    if bad.any():
+        delta = np.where(bad, 0.5 if is_call else -0.5, delta)
+        gamma = np.where(bad, 0.01, gamma)
+        theta = np.where(bad, -0.05, theta)
+        vega = np.where(bad, 0.15, vega)
+        rho = np.where(bad, 0.01, rho)
+
+    return delta, gamma, theta, vega, rho
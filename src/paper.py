@@ -4,6 +4,11 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 
 
+def _timestamp() -> str:
+    """'YYYY-MM-DD HH:MM' for trade records"""
+    return datetime.now().isoformat(sep=' ', timespec='minutes')
+
+
 class PaperTradingPortfolio:
     """Simulated portfolio for paper trading Iron Condors"""
 
@@ -11,9 +16,11 @@ class PaperTradingPortfolio:
         self.cash = initial_cash
         self.initial_cash = initial_cash
         self.positions: List[Dict[str, Any]] = []
+        self._position_by_id: Dict[int, Dict[str, Any]] = {}  # open positions by id
         self.closed_positions: List[Dict[str, Any]] = []
         self.trade_count = 0
         self.total_pnl = 0.0
+        self.margin_in_use = 0.0  # running sum of margin_held over open positions
 
     def open_position(self, setup: Dict, quantity: int = 1) -> Tuple[bool, str]:
         """Open a new Iron Condor paper trade"""
@@ -32,28 +39,31 @@ class PaperTradingPortfolio:
             'entry_credit': credit,
             'max_loss': max_loss,
             'margin_held': margin_required,
-            'entry_time': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'entry_time': _timestamp(),
             'expiration': setup.get('short_call', {}).get('expiration_date', 'N/A'),
             'status': 'open',
             'current_pnl': 0.0
         }
 
         self.cash -= margin_required
+        self.margin_in_use += margin_required
         self.positions.append(position)
+        self._position_by_id[position['id']] = position
         return True, f"Opened IC #{self.trade_count} for ${credit:,.2f} credit"
 
     def close_position(self, position_id: int, pnl_pct: float = 0.5) -> Tuple[bool, str]:
         """Close a position at a given P&L percentage of max profit"""
-        pos = next((p for p in self.positions if p['id'] == position_id), None)
+        pos = self._position_by_id.pop(position_id, None)
         if not pos:
             return False, f"Position #{position_id} not found"
 
         realized_pnl = pos['entry_credit'] * pnl_pct
         self.cash += pos['margin_held'] + realized_pnl
+        self.margin_in_use -= pos['margin_held']
         self.total_pnl += realized_pnl
 
         pos['status'] = 'closed'
-        pos['close_time'] = datetime.now().strftime('%Y-%m-%d %H:%M')
+        pos['close_time'] = _timestamp()
         pos['realized_pnl'] = realized_pnl
 
         self.positions.remove(pos)
@@ -62,11 +72,10 @@ class PaperTradingPortfolio:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get portfolio statistics"""
-        margin_in_use = sum(p['margin_held'] for p in self.positions)
-        account_value = self.cash + margin_in_use
+        account_value = self.cash + self.margin_in_use
         return {
             'cash': self.cash,
-            'margin_in_use': margin_in_use,
+            'margin_in_use': self.margin_in_use,
             'account_value': account_value,
             'total_pnl': account_value - self.initial_cash,
             'open_positions': len(self.positions),
@@ -79,5 +88,3 @@ def initialize_paper_trading():
     """Initialize paper trading session state if not present"""
     if 'paper_portfolio' not in st.session_state:
         st.session_state.paper_portfolio = PaperTradingPortfolio(initial_cash=10000.0)
-    if 'paper_trading_enabled' not in st.session_state:
-        st.session_state.paper_trading_enabled = False
@@ -0,0 +1,30 @@
+from src.analysis import find_iron_condor_strikes
+
+
+def _opt(kind, strike, bid, ask, delta=None):
+    opt = {'type': kind, 'strike': strike, 'bid': bid, 'ask': ask}
+    if delta is not None:
+        opt['greeks'] = {'delta': delta}
+    return opt
+
+
+def _chain(short_call_delta):
+    return {'2026-11-20': [
+        _opt('call', 105.0, 1.00, 1.10, short_call_delta),
+        _opt('call', 110.0, 0.40, 0.50),
+        _opt('put', 95.0, 1.20, 1.30, -0.20),
+        _opt('put', 90.0, 0.50, 0.60),
+    ]}
+
+
+def test_pop_uses_short_leg_deltas():
+    setup = find_iron_condor_strikes(_chain(0.20), '2026-11-20', 100.0, 0.20)
+    assert setup['short_call']['strike'] == 105.0
+    assert setup['short_put']['strike'] == 95.0
+    assert setup['pop'] == 60.0
+
+
+def test_pop_assumes_0_3_delta_for_leg_without_greeks():
+    setup = find_iron_condor_strikes(_chain(None), '2026-11-20', 100.0, 0.20)
+    assert setup['short_call']['strike'] == 105.0
+    assert setup['pop'] == 50.0
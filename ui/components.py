@@ -1,6 +1,23 @@
 # ui/components.py
 import streamlit as st
-from datetime import datetime
+from datetime import date
+from pathlib import Path
+
+from src.data import days_to_expiry
+
+THEME_CSS_PATH = Path(__file__).with_name("theme.css")
+
+
+@st.cache_resource
+def _load_theme_css() -> str:
+    """Read the stylesheet once per process"""
+    return f"<style>\n{THEME_CSS_PATH.read_text(encoding='utf-8')}</style>"
+
+
+def inject_theme_css():
+    """Dark professional theme (must be re-emitted on every full rerun)"""
+    st.markdown(_load_theme_css(), unsafe_allow_html=True)
+
 
 def display_header():
     """Main app title and subtitle"""
@@ -38,7 +55,13 @@ def display_current_metrics(df, current_price: float, entry_score: int, risk_sco
 
     price_change = 0
     if len(df) >= 2:
-        price_change = ((current_price - df['Close'].iloc[-2]) / df['Close'].iloc[-2]) * 100
+        prev_close = float(df['Close'].iat[-2])
+        price_change = ((current_price - prev_close) / prev_close) * 100
+
+    # Single scalars straight from their columns (no full-row Series)
+    has_rows = len(df) > 0
+    rsi = float(df['RSI'].iat[-1]) if has_rows and 'RSI' in df.columns else 50.0
+    atr_pct = float(df['ATR_pct'].iat[-1]) if has_rows and 'ATR_pct' in df.columns else 1.0
 
     with col1:
         st.metric("SPY Price", f"${current_price:.2f}", f"{price_change:+.2f}%")
@@ -50,14 +73,19 @@ def display_current_metrics(df, current_price: float, entry_score: int, risk_sco
         st.metric("Risk Score", f"{risk_score}/9", "High" if risk_score >= 5 else "Low")
 
     with col4:
-        rsi = df.iloc[-1].get('RSI', 50)
         st.metric("RSI", f"{rsi:.1f}", "Neutral" if 40 <= rsi <= 60 else "Extreme")
 
     with col5:
-        atr_pct = df.iloc[-1].get('ATR_pct', 1.0) if 'ATR_pct' in df.columns else 1.0
         st.metric("ATR %", f"{atr_pct:.2f}%", "Low Vol ✅" if atr_pct < 1.5 else "High Vol ⚠️")
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _expiry_labels(expirations: tuple, today: str) -> dict:
+    """'YYYY-MM-DD  (Nd)' label per expiration, built once per day"""
+    dte = days_to_expiry(expirations, date.fromisoformat(today))
+    return {exp: f"{exp}  ({dte[exp]}d)" for exp in expirations}
+
+
 def display_expiry_selector(expirations: list):
     """Compact dropdown for expiration selection"""
     if not expirations:
@@ -68,24 +96,15 @@ def display_expiry_selector(expirations: list):
     if selected not in expirations:
         selected = expirations[0]
 
-    # Build labels with DTE
-    options = []
-    for exp in expirations[:12]:
-        dte = (datetime.strptime(exp, '%Y-%m-%d') - datetime.now()).days
-        options.append(f"{exp}  ({dte}d)")
-
-    default_idx = 0
-    for i, opt in enumerate(options):
-        if selected in opt:
-            default_idx = i
-            break
+    # Options are the dates themselves; the DTE labels are only display text
+    shown = tuple(expirations[:12])
+    labels = _expiry_labels(shown, date.today().isoformat())
+    default_idx = shown.index(selected) if selected in shown else 0
 
-    choice = st.selectbox("📅 Expiration", options, index=default_idx, key="expiry_dropdown")
+    chosen_date = st.selectbox("📅 Expiration", shown, index=default_idx,
+                               format_func=labels.get, key="expiry_dropdown")
 
-    # Extract date from the label
-    chosen_date = choice.split("  ")[0]
     if chosen_date != selected:
         st.session_state.selected_expiry = chosen_date
 
     return chosen_date
-
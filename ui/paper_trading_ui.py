@@ -2,7 +2,8 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from src.paper import PaperTradingPortfolio
+from src.analysis import find_iron_condor_strikes_batch
+from src.paper import PaperTradingPortfolio, initialize_paper_trading
 
 
 def display_paper_trading_dashboard(portfolio: PaperTradingPortfolio):
@@ -15,21 +16,16 @@ def display_paper_trading_dashboard(portfolio: PaperTradingPortfolio):
 
     st.markdown("## 📈 Paper Trading Dashboard")
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.metric("Account Value", f"${stats['account_value']:,.2f}",
-                  delta=f"{stats['total_pnl']:,.2f}", delta_color="normal")
-
-    with col2:
-        st.metric("Cash Balance", f"${stats['cash']:,.2f}")
-
-    with col3:
-        pnl_color = "normal" if stats['total_pnl'] >= 0 else "inverse"
-        st.metric("Total P&L", f"${stats['total_pnl']:,.2f}", delta_color=pnl_color)
-
-    with col4:
-        st.metric("Open Positions", stats['open_positions'])
+    total_pnl = stats['total_pnl']
+    # (label, value, delta, delta_color) per column
+    metrics = [
+        ("Account Value", f"${stats['account_value']:,.2f}", f"{total_pnl:,.2f}", "normal"),
+        ("Cash Balance", f"${stats['cash']:,.2f}", None, "normal"),
+        ("Total P&L", f"${total_pnl:,.2f}", None, "normal" if total_pnl >= 0 else "inverse"),
+        ("Open Positions", stats['open_positions'], None, "normal"),
+    ]
+    for col, (label, value, delta, color) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value, delta=delta, delta_color=color)
 
     # Trade history summary
     if stats['closed_trades'] > 0:
@@ -47,33 +43,38 @@ def display_open_position_form(options_data, current_price, selected_expiry, ic_
         st.warning("No valid Iron Condor setups available yet.")
         return
 
-    setup_options = [f"{i+1}: {s['pop']}% POP — Δ {s['target_delta']}" for i, s in enumerate(ic_setups)]
-    choice = st.selectbox("Select Setup", setup_options)
+    # Options are setup indices; labels are formatted once, no parse-back
+    labels = [f"{i+1}: {s['pop']}% POP — Δ {s['target_delta']}" for i, s in enumerate(ic_setups)]
+    idx = st.selectbox("Select Setup", range(len(ic_setups)), format_func=labels.__getitem__)
 
-    if choice:
-        idx = int(choice.split(":")[0]) - 1
+    if idx is not None:
         selected_setup = ic_setups[idx]
+        short_call, long_call = selected_setup['short_call'], selected_setup['long_call']
+        short_put, long_put = selected_setup['short_put'], selected_setup['long_put']
 
         col1, col2 = st.columns(2)
         with col1:
-            st.markdown("**Call Spread**")
-            st.write(f"Short: {selected_setup['short_call']['strike']} @ {selected_setup['short_call']['bid']:.2f}")
-            st.write(f"Long:  {selected_setup['long_call']['strike']} @ {selected_setup['long_call']['ask']:.2f}")
+            st.markdown(
+                f"**Call Spread**  \nShort: {short_call['strike']} @ {short_call['bid']:.2f}  \n"
+                f"Long:  {long_call['strike']} @ {long_call['ask']:.2f}"
+            )
 
         with col2:
-            st.markdown("**Put Spread**")
-            st.write(f"Short: {selected_setup['short_put']['strike']} @ {selected_setup['short_put']['bid']:.2f}")
-            st.write(f"Long:  {selected_setup['long_put']['strike']} @ {selected_setup['long_put']['ask']:.2f}")
+            st.markdown(
+                f"**Put Spread**  \nShort: {short_put['strike']} @ {short_put['bid']:.2f}  \n"
+                f"Long:  {long_put['strike']} @ {long_put['ask']:.2f}"
+            )
 
+        # Quantity stays outside the form so the totals below preview it live
         quantity = st.number_input("Contracts (quantity)", min_value=1, max_value=20, value=1)
 
-        credit = selected_setup['max_profit'] * quantity
-        risk = selected_setup['max_loss'] * quantity
+        st.metric("Expected Credit", f"${selected_setup['max_profit'] * quantity:,.2f}")
+        st.metric("Max Risk / Margin", f"${selected_setup['max_loss'] * quantity:,.2f}")
 
-        st.metric("Expected Credit", f"${credit:,.2f}")
-        st.metric("Max Risk / Margin", f"${risk:,.2f}")
+        with st.form("open_ic"):
+            submitted = st.form_submit_button("Open Paper Trade", type="primary")
 
-        if st.button("Open Paper Trade", type="primary"):
+        if submitted:
             success, msg = st.session_state.paper_portfolio.open_position(selected_setup, quantity)
             if success:
                 st.success(msg)
@@ -81,54 +82,62 @@ def display_open_position_form(options_data, current_price, selected_expiry, ic_
                 st.error(msg)
 
 
+def _close_selected_position(portfolio: PaperTradingPortfolio):
+    """Close-button callback: runs before the rerun renders anything"""
+    st.session_state.close_result = portfolio.close_position(
+        st.session_state.close_pos_id, st.session_state.close_pct / 100
+    )
+
+
 def display_positions_table(portfolio: PaperTradingPortfolio, options_data, current_price):
     """Detailed view of open positions with strike info"""
+    # Outcome of a close made by the callback on the previous click
+    close_result = st.session_state.pop("close_result", None)
+    if close_result:
+        success, msg = close_result
+        (st.success if success else st.error)(msg)
+
     if not portfolio.positions:
         st.info("No open positions yet.")
         return
 
     st.subheader("Open Positions")
 
-    data = []
-    for pos in portfolio.positions:
-        setup = pos['setup']
-        row = {
-            'ID': pos['id'],
-            'Expiration': pos['expiration'],
-            'Qty': pos['quantity'],
-            'Short Call': setup['short_call']['strike'],
-            'Long Call': setup['long_call']['strike'],
-            'Short Put': setup['short_put']['strike'],
-            'Long Put': setup['long_put']['strike'],
-            'Entry Credit': f"${pos['entry_credit']:,.2f}",
-            'Max Risk': f"${pos['max_loss']:,.2f}",
-            'Status': pos['status']
-        }
-        data.append(row)
-
-    df = pd.DataFrame(data)
+    # Column-wise build: one list per column, handed to pandas as-is
+    positions = portfolio.positions
+    setups = [pos['setup'] for pos in positions]
+    df = pd.DataFrame({
+        'ID': [pos['id'] for pos in positions],
+        'Expiration': [pos['expiration'] for pos in positions],
+        'Qty': [pos['quantity'] for pos in positions],
+        'Short Call': [setup['short_call']['strike'] for setup in setups],
+        'Long Call': [setup['long_call']['strike'] for setup in setups],
+        'Short Put': [setup['short_put']['strike'] for setup in setups],
+        'Long Put': [setup['long_put']['strike'] for setup in setups],
+        'Entry Credit': [f"${pos['entry_credit']:,.2f}" for pos in positions],
+        'Max Risk': [f"${pos['max_loss']:,.2f}" for pos in positions],
+        'Status': [pos['status'] for pos in positions],
+    })
     st.dataframe(df, use_container_width=True, hide_index=True)
 
-    # Close position buttons
+    # Close position buttons — the close happens in the button callback, so the
+    # click's own (fragment) rerun already shows the updated dashboard and table
     st.markdown("---")
     st.subheader("Close a Position")
-    if portfolio.positions:
-        pos_choice = st.selectbox("Select Position to Close",
-                                  [f"#{p['id']} — Credit ${p['entry_credit']:,.2f}" for p in portfolio.positions])
-        close_pct = st.slider("Close at % of max profit", 0, 100, 50) / 100
-        if st.button("Close Position", type="secondary"):
-            pos_id = int(pos_choice.split("#")[1].split(" ")[0])
-            success, msg = portfolio.close_position(pos_id, close_pct)
-            if success:
-                st.success(msg)
-                st.rerun()
-            else:
-                st.error(msg)
+    # Options are the position ids; the label is display-only
+    labels = {p['id']: f"#{p['id']} — Credit ${p['entry_credit']:,.2f}" for p in portfolio.positions}
+    st.selectbox("Select Position to Close", list(labels), format_func=labels.get, key="close_pos_id")
+    st.slider("Close at % of max profit", 0, 100, 50, key="close_pct")
+    st.button("Close Position", type="secondary", on_click=_close_selected_position, args=(portfolio,))
+
 
+def display_paper_trading_panel(options_data, current_price, selected_expiry,
+                                target_deltas=(0.16, 0.20, 0.30), setups=None):
+    """Main entry point – call this from app.py
 
-def display_paper_trading_panel(options_data, current_price, selected_expiry):
-    """Main entry point – call this from app.py"""
-    from src.paper import initialize_paper_trading
+    Pass ``setups`` (one per target delta) when the caller already ran the
+    strike search, otherwise it is done here in a single batched pass.
+    """
     initialize_paper_trading()
 
     portfolio = st.session_state.paper_portfolio
@@ -142,10 +151,10 @@ def display_paper_trading_panel(options_data, current_price, selected_expiry):
         display_positions_table(portfolio, options_data, current_price)
 
     with tab3:
-        from src.analysis import find_iron_condor_strikes
+        if setups is None:
+            setups = find_iron_condor_strikes_batch(options_data, selected_expiry, current_price, target_deltas)
         ic_setups = []
-        for delta in [0.16, 0.20, 0.30]:
-            setup = find_iron_condor_strikes(options_data, selected_expiry, current_price, delta)
+        for delta, setup in zip(target_deltas, setups):
             if setup:
                 setup['target_delta'] = delta
                 ic_setups.append(setup)
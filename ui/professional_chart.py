@@ -6,6 +6,7 @@ Professional Iron Condor Chart System
 - Entry AND Exit signals
 """
 
+import functools
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -13,7 +14,138 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
 
-def display_professional_chart(df, current_price, entry_score, risk_score):
+from src.analysis import df_fingerprint, sma
+
+CHART_CONFIG = {
+    'displayModeBar': True,
+    'displaylogo': False,
+    'modeBarButtonsToAdd': ['drawline', 'drawopenpath', 'eraseshape'],
+    'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+    'toImageButtonOptions': {
+        'format': 'png',
+        'filename': 'spy_iron_condor_chart',
+        'height': 1200,
+        'width': 1600,
+        'scale': 2
+    },
+    'scrollZoom': True  # Enable scroll wheel zoom
+}
+
+# Static help copy, built once at import rather than on every render
+HOW_TO_READ_PRICE = """
+**📈 Price Action**
+- **Candlesticks**: Green = up, Red = down
+- **Bollinger Bands**: Gray bands show volatility
+- **SMA20**: Orange line = 20-day average
+
+**For Iron Condors:**
+✅ Price in middle of bands = GOOD
+❌ Price touching bands = AVOID
+"""
+
+HOW_TO_READ_INDICATORS = """
+**📊 Technical Indicators**
+- **RSI**: Momentum (0-100)
+  - 40-60 = Ideal range
+  - >70 = Overbought
+  - <30 = Oversold
+- **MACD**: Trend strength
+  - Positive = Bullish
+  - Negative = Bearish
+"""
+
+HOW_TO_READ_SIGNALS = """
+**🎯 Entry/Exit Signals**
+- **🟢 Green UP Arrow** = ENTRY SIGNAL
+  - Entry Score ≥ 6
+  - Risk Score ≤ 3
+- **🔴 Red DOWN Arrow** = EXIT SIGNAL
+  - Risk Score ≥ 5
+- **ATR%**: Volatility measure
+  - <2% = Low vol (good)
+  - >3% = High vol (avoid)
+"""
+
+CHART_TIPS = """
+📊 **Interactive Chart Features:**
+• **Click & Drag** to zoom into specific time periods
+• **Double-Click** to reset zoom
+• **Scroll Wheel** to zoom in/out
+• **Hover** to see detailed values
+• **Camera Icon** to download chart as PNG
+• **Pan Mode** (drag icon) to move around when zoomed
+• **Box Zoom** to select exact area to zoom
+"""
+
+
+def _hline(row, y, color, dash, opacity):
+    return dict(type='line', xref=f'x{row} domain', x0=0, x1=1, yref=f'y{row}', y0=y, y1=y,
+                line=dict(color=color, dash=dash), opacity=opacity)
+
+
+def _hband(row, y0, y1, color, opacity):
+    return dict(type='rect', xref=f'x{row} domain', x0=0, x1=1, yref=f'y{row}', y0=y0, y1=y1,
+                fillcolor=color, opacity=opacity)
+
+
+# Reference levels and zones per indicator row, applied in one layout update
+# instead of one add_hline/add_hrect call (and validation pass) each
+RSI_SHAPES = [
+    _hline(2, 70, 'red', 'dash', 0.5),
+    _hline(2, 30, 'green', 'dash', 0.5),
+    _hline(2, 50, 'gray', 'dot', 0.3),
+    _hband(2, 40, 60, 'green', 0.1),     # ideal zone
+]
+MACD_SHAPES = [
+    _hline(3, 0, 'gray', 'dash', 0.5),
+]
+ATR_SHAPES = [
+    _hline(4, 2, 'green', 'dash', 0.5),
+    _hline(4, 3, 'red', 'dash', 0.5),
+    _hband(4, 0, 2, 'green', 0.05),      # low-vol zone
+]
+
+
+def _f32(values):
+    """
+    Contiguous float32 copy of a column — plotly ships these as compact
+    base64 typed arrays instead of JSON number lists
+    """
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+SUBPLOT_TITLES = ('SPY Price with Signals', 'RSI (14)', 'MACD', 'ATR % Volatility', 'Volume')
+
+
+@functools.lru_cache(maxsize=1)
+def _subplot_layout():
+    """
+    Axis domains and subplot-title annotations of the 5-row grid; the grid
+    never changes, so make_subplots runs once per process instead of per build
+    """
+    return make_subplots(
+        rows=5, cols=1,
+        row_heights=[0.4, 0.15, 0.15, 0.15, 0.15],
+        vertical_spacing=0.03,
+        subplot_titles=SUBPLOT_TITLES,
+    ).layout.to_plotly_json()
+
+
+def _axis_ref(axis, row):
+    """
+    Trace axis id for a grid row ('x', 'x2', ... / 'y', 'y2', ...)
+    """
+    return axis if row == 1 else f'{axis}{row}'
+
+
+def _last(df, col, default):
+    """
+    Last value of a column as a plain float, or ``default`` if it is missing
+    """
+    return float(df[col].to_numpy()[-1]) if col in df.columns else default
+
+
+def display_professional_chart(df, current_price, entry_score, risk_score, interval):
     """
     Display ONE comprehensive chart with all indicators and signals
     """
@@ -27,55 +159,32 @@ def display_professional_chart(df, current_price, entry_score, risk_score):
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.markdown("""
-            **📈 Price Action**
-            - **Candlesticks**: Green = up, Red = down
-            - **Bollinger Bands**: Gray bands show volatility
-            - **SMA20**: Orange line = 20-day average
-            
-            **For Iron Condors:**
-            ✅ Price in middle of bands = GOOD
-            ❌ Price touching bands = AVOID
-            """)
+            st.markdown(HOW_TO_READ_PRICE)
         
         with col2:
-            st.markdown("""
-            **📊 Technical Indicators**
-            - **RSI**: Momentum (0-100)
-              - 40-60 = Ideal range
-              - >70 = Overbought
-              - <30 = Oversold
-            - **MACD**: Trend strength
-              - Positive = Bullish
-              - Negative = Bearish
-            """)
+            st.markdown(HOW_TO_READ_INDICATORS)
         
         with col3:
-            st.markdown("""
-            **🎯 Entry/Exit Signals**
-            - **🟢 Green UP Arrow** = ENTRY SIGNAL
-              - Entry Score ≥ 6
-              - Risk Score ≤ 3
-            - **🔴 Red DOWN Arrow** = EXIT SIGNAL
-              - Risk Score ≥ 5
-            - **ATR%**: Volatility measure
-              - <2% = Low vol (good)
-              - >3% = High vol (avoid)
-            """)
+            st.markdown(HOW_TO_READ_SIGNALS)
     
     # Display current indicator values at the top
     st.markdown("### 📊 Current Technical Readings")
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
-    # Get latest values
-    latest = df.iloc[-1]
-    rsi = latest.get('RSI', 0)
-    macd = latest.get('MACD', 0)
-    atr_pct = latest.get('ATR_pct', 0)
-    volume = latest.get('Volume', 0)
-    bb_position = ((current_price - latest.get('BB_lower', current_price)) / 
-                   (latest.get('BB_upper', current_price) - latest.get('BB_lower', current_price)) * 100)
+    # Get latest values (read straight off the column arrays, no row Series)
+    rsi = _last(df, 'RSI', 0)
+    macd = _last(df, 'MACD', 0)
+    atr_pct = _last(df, 'ATR_pct', 0)
+    volume = _last(df, 'Volume', 0)
+    bb_lower = _last(df, 'BB_lower', current_price)
+    bb_range = _last(df, 'BB_upper', current_price) - bb_lower
+    # Flat (or missing) bands read as mid-band, same rule as the chart markers
+    bb_position = (current_price - bb_lower) / bb_range * 100 if bb_range else 50.0
+    # Last value of the 20-bar volume MA (mean of everything on shorter frames)
+    vol_ma = _last(df, 'Vol_MA20', None)
+    if vol_ma is None:
+        vol_ma = df['Volume'].to_numpy()[-20:].mean() if 'Volume' in df.columns else np.nan
     
     with col1:
         rsi_color = "🟢" if 40 <= rsi <= 60 else "🔴" if rsi > 70 or rsi < 30 else "🟡"
@@ -98,7 +207,6 @@ def display_professional_chart(df, current_price, entry_score, risk_score):
         st.caption(f"{bb_color} {'Middle' if 30 <= bb_position <= 70 else 'Edge'}")
     
     with col5:
-        vol_ma = df['Volume'].rolling(20).mean().iloc[-1] if len(df) >= 20 else df['Volume'].mean()
         # Safe volume comparison
         if pd.notna(vol_ma) and pd.notna(volume) and vol_ma > 0:
             vol_color = "🟢" if volume < vol_ma * 1.2 else "🟡"
@@ -110,89 +218,184 @@ def display_professional_chart(df, current_price, entry_score, risk_score):
         st.caption(f"{vol_color} {vol_status}")
     
     # Add zoom instructions
-    st.info("""
-    📊 **Interactive Chart Features:**
-    • **Click & Drag** to zoom into specific time periods
-    • **Double-Click** to reset zoom
-    • **Scroll Wheel** to zoom in/out
-    • **Hover** to see detailed values
-    • **Camera Icon** to download chart as PNG
-    • **Pan Mode** (drag icon) to move around when zoomed
-    • **Box Zoom** to select exact area to zoom
-    """)
+    st.info(CHART_TIPS)
+    
+    fig = build_professional_chart(df, current_price, entry_signal, exit_signal, interval)
+    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG)
+    
+    # Overall Signal Assessment (collapsible to save space on mobile)
+    st.markdown("---")
+    with st.expander("🎯 Overall Iron Condor Signal Assessment", expanded=True):
+    
+        col1, col2 = st.columns([2, 3])
+    
+        with col1:
+            # Count favorable conditions
+            conditions = []
+            if 40 <= rsi <= 60:
+                conditions.append("✅ RSI in neutral zone")
+            else:
+                conditions.append("❌ RSI extreme")
+
+            if atr_pct < 2:
+                conditions.append("✅ Low volatility")
+            elif atr_pct < 3:
+                conditions.append("🟡 Moderate volatility")
+            else:
+                conditions.append("❌ High volatility")
+
+            if 30 <= bb_position <= 70:
+                conditions.append("✅ Price in BB middle")
+            else:
+                conditions.append("❌ Price at BB edge")
+
+            if abs(macd) < 2:
+                conditions.append("✅ Weak trend")
+            else:
+                conditions.append("❌ Strong trend")
+
+            # Volume check with safety for NaN
+            if pd.notna(vol_ma) and pd.notna(volume) and volume < vol_ma * 1.2:
+                conditions.append("✅ Normal volume")
+            elif pd.notna(vol_ma) and pd.notna(volume):
+                conditions.append("🟡 High volume")
+            else:
+                conditions.append("🟡 Volume N/A")
+
+            green_count = sum(1 for c in conditions if c.startswith("✅"))
+
+            # One markdown element for the score and all five conditions
+            st.markdown("  \n".join([f"**Score: {green_count}/5 Favorable**", *conditions]))
+
+        with col2:
+            if green_count >= 4:
+                st.success(f"""
+                **🟢 STRONG ENTRY SIGNAL**
+
+                **Recommendation:** Open Iron Condor position now
+
+                **Setup:** Use the BALANCED (20Δ) setup below
+                - Conservative: 16Δ for higher win rate
+                - Aggressive: 30Δ for more premium
+
+                **Entry Score:** {entry_score}/10
+                **Risk Score:** {risk_score}/10
+                """)
+            elif green_count >= 3:
+                st.warning(f"""
+                **🟡 MODERATE SIGNAL**
+
+                **Recommendation:** Consider waiting for better conditions
+
+                **What to watch:**
+                - Wait for RSI to reach 40-60
+                - Watch for volatility to drop below 2%
+                - Ensure price moves to middle of Bollinger Bands
+
+                **Entry Score:** {entry_score}/10
+                **Risk Score:** {risk_score}/10
+                """)
+            else:
+                st.error(f"""
+                **🔴 AVOID / EXIT**
+
+                **Recommendation:** Do NOT enter new positions
+
+                **Issues:**
+                - Too many unfavorable conditions
+                - High risk environment for Iron Condors
+                - If holding positions, consider closing
+
+                **Entry Score:** {entry_score}/10
+                **Risk Score:** {risk_score}/10
+                """)
+
+
+@st.cache_resource(ttl=60, max_entries=8, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
+def build_professional_chart(df, current_price, entry_signal, exit_signal, interval):
+    """
+    Build the 5-row price/indicator figure (cached on the df fingerprint).
+
+    Held as a shared resource: callers only pass it to st.plotly_chart,
+    which reads the figure and never mutates it, so a cache hit skips the
+    pickle round-trip st.cache_data would do.
+    """
     
     # Create the main chart with subplots
-    fig = make_subplots(
-        rows=5, cols=1,
-        row_heights=[0.4, 0.15, 0.15, 0.15, 0.15],
-        vertical_spacing=0.03,
-        subplot_titles=('SPY Price with Signals', 'RSI (14)', 'MACD', 'ATR % Volatility', 'Volume'),
-        specs=[[{"secondary_y": False}],
-               [{"secondary_y": False}],
-               [{"secondary_y": False}],
-               [{"secondary_y": False}],
-               [{"secondary_y": False}]]
-    )
+    fig = go.Figure(layout=_subplot_layout())
     
+    # (trace, row) pairs, added to the figure in one batch at the end
+    traces = []
+
     # Row 1: Price chart with Bollinger Bands
-    fig.add_trace(go.Candlestick(
+    traces.append((go.Candlestick(
         x=df.index,
-        open=df['Open'],
-        high=df['High'],
-        low=df['Low'],
-        close=df['Close'],
+        open=_f32(df['Open']),
+        high=_f32(df['High']),
+        low=_f32(df['Low']),
+        close=_f32(df['Close']),
         name='SPY',
         increasing_line_color='#26a69a',
         decreasing_line_color='#ef5350'
-    ), row=1, col=1)
+    ), 1))
     
     # Add Bollinger Bands
     if 'BB_upper' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['BB_upper'],
+        traces.append((go.Scatter(
+            x=df.index, y=_f32(df['BB_upper']),
             name='BB Upper',
             line=dict(color='rgba(128,128,128,0.5)', dash='dash'),
+            hoverinfo='skip',
             showlegend=False
-        ), row=1, col=1)
+        ), 1))
         
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['BB_lower'],
+        traces.append((go.Scatter(
+            x=df.index, y=_f32(df['BB_lower']),
             name='BB Lower',
             line=dict(color='rgba(128,128,128,0.5)', dash='dash'),
             fill='tonexty',
             fillcolor='rgba(128,128,128,0.1)',
+            hoverinfo='skip',
             showlegend=False
-        ), row=1, col=1)
+        ), 1))
     
     # Add SMA20
     if 'SMA20' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['SMA20'],
+        traces.append((go.Scatter(
+            x=df.index, y=_f32(df['SMA20']),
             name='SMA20',
             line=dict(color='orange', width=2, dash='dash'),
+            hoverinfo='skip',
             showlegend=True
-        ), row=1, col=1)
+        ), 1))
     
     # ── Compute HISTORICAL entry & exit signals per bar ──────────────────
-    entry_mask = pd.Series(False, index=df.index)
-    exit_mask = pd.Series(False, index=df.index)
+    entry_mask = np.zeros(len(df), dtype=bool)
+    exit_mask = np.zeros(len(df), dtype=bool)
 
     if 'RSI' in df.columns and 'BB_lower' in df.columns and 'BB_upper' in df.columns:
-        bb_range = (df['BB_upper'] - df['BB_lower']).replace(0, np.nan)
-        bb_pos = ((df['Close'] - df['BB_lower']) / bb_range * 100).fillna(50)
-        rsi_ok   = df['RSI'].between(40, 60)
-        bb_ok    = bb_pos.between(30, 70)
-        macd_ok  = df['MACD'].abs() < 2 if 'MACD' in df.columns else True
-        atr_ok   = df['ATR_pct'] < 2.0 if 'ATR_pct' in df.columns else True
+        bb_lower = df['BB_lower'].to_numpy()
+        bb_range = df['BB_upper'].to_numpy() - bb_lower
+        bb_pos = np.full(len(df), 50.0)  # flat bands count as mid-band
+        np.divide((df['Close'].to_numpy() - bb_lower) * 100, bb_range, out=bb_pos, where=bb_range != 0)
+        rsi = df['RSI'].to_numpy()
+        rsi_ok   = (rsi >= 40) & (rsi <= 60)
+        bb_ok    = (bb_pos >= 30) & (bb_pos <= 70)
+        macd_ok  = np.abs(df['MACD'].to_numpy()) < 2 if 'MACD' in df.columns else True
+        atr      = df['ATR_pct'].to_numpy() if 'ATR_pct' in df.columns else None
+        atr_ok   = atr < 2.0 if atr is not None else True
 
         entry_mask = rsi_ok & bb_ok & macd_ok & atr_ok
-        exit_mask  = (~rsi_ok & ~bb_ok) | (df.get('ATR_pct', pd.Series(1, index=df.index)) > 3)
+        exit_mask  = ~rsi_ok & ~bb_ok
+        if atr is not None:
+            exit_mask |= atr > 3
 
+    # One WebGL marker trace per direction holding every historical signal bar
     # Plot ENTRY arrows (green triangles)
     if entry_mask.any():
         entry_dates  = df.index[entry_mask]
-        entry_prices = df.loc[entry_mask, 'Low'] * 0.997  # just below the low
-        fig.add_trace(go.Scatter(
+        entry_prices = _f32(df['Low'].to_numpy()[entry_mask] * 0.997)  # just below the low
+        traces.append((go.Scattergl(
             x=entry_dates,
             y=entry_prices,
             mode='markers',
@@ -205,13 +408,13 @@ def display_professional_chart(df, current_price, entry_score, risk_score):
             name='⬆ ENTRY',
             showlegend=True,
             hovertemplate='ENTRY<br>%{x}<extra></extra>',
-        ), row=1, col=1)
+        ), 1))
 
     # Plot EXIT arrows (red triangles)
     if exit_mask.any():
         exit_dates  = df.index[exit_mask]
-        exit_prices = df.loc[exit_mask, 'High'] * 1.003  # just above the high
-        fig.add_trace(go.Scatter(
+        exit_prices = _f32(df['High'].to_numpy()[exit_mask] * 1.003)  # just above the high
+        traces.append((go.Scattergl(
             x=exit_dates,
             y=exit_prices,
             mode='markers',
@@ -224,116 +427,114 @@ def display_professional_chart(df, current_price, entry_score, risk_score):
             name='⬇ EXIT',
             showlegend=True,
             hovertemplate='EXIT / AVOID<br>%{x}<extra></extra>',
-        ), row=1, col=1)
+        ), 1))
 
     # Also add a prominent annotation arrow for the CURRENT signal
+    last_x = df.index[-1]
     if entry_signal:
         fig.add_annotation(
-            x=df.index[-1], y=current_price * 0.993,
+            x=last_x, y=current_price * 0.993,
             text='⬆ ENTER NOW', showarrow=True, arrowhead=2,
             arrowsize=1.5, arrowwidth=2, arrowcolor='#00e676',
             font=dict(size=13, color='#00e676', family='Arial Black'),
             bgcolor='rgba(0,230,118,0.15)', bordercolor='#00e676',
-            row=1, col=1
+            xref='x', yref='y'
         )
     if exit_signal:
         fig.add_annotation(
-            x=df.index[-1], y=current_price * 1.007,
+            x=last_x, y=current_price * 1.007,
             text='⬇ EXIT NOW', showarrow=True, arrowhead=2,
             arrowsize=1.5, arrowwidth=2, arrowcolor='#ff1744',
             font=dict(size=13, color='#ff1744', family='Arial Black'),
             bgcolor='rgba(255,23,68,0.15)', bordercolor='#ff1744',
-            row=1, col=1
+            xref='x', yref='y'
         )
     
+    shapes = []
+
     # Row 2: RSI
     if 'RSI' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['RSI'],
+        traces.append((go.Scattergl(
+            x=df.index, y=_f32(df['RSI']),
             name='RSI',
             line=dict(color='purple', width=2),
             showlegend=False
-        ), row=2, col=1)
-        
-        # Add RSI levels
-        fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=2, col=1)
-        fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.5, row=2, col=1)
-        fig.add_hline(y=50, line_dash="dot", line_color="gray", opacity=0.3, row=2, col=1)
-        
-        # Shade ideal zone
-        fig.add_hrect(y0=40, y1=60, fillcolor="green", opacity=0.1, row=2, col=1)
+        ), 2))
+        shapes += RSI_SHAPES
     
     # Row 3: MACD
     if 'MACD' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['MACD'],
+        traces.append((go.Scattergl(
+            x=df.index, y=_f32(df['MACD']),
             name='MACD',
             line=dict(color='blue', width=2),
             showlegend=False
-        ), row=3, col=1)
+        ), 3))
         
         if 'MACD_signal' in df.columns:
-            fig.add_trace(go.Scatter(
-                x=df.index, y=df['MACD_signal'],
+            traces.append((go.Scattergl(
+                x=df.index, y=_f32(df['MACD_signal']),
                 name='Signal',
                 line=dict(color='red', width=1),
                 showlegend=False
-            ), row=3, col=1)
+            ), 3))
         
         # MACD histogram
         if 'MACD_hist' in df.columns:
-            colors = ['green' if val >= 0 else 'red' for val in df['MACD_hist']]
-            fig.add_trace(go.Bar(
-                x=df.index, y=df['MACD_hist'],
+            # 0/1 sign index on a two-stop scale instead of a per-bar colour string
+            hist = df['MACD_hist'].to_numpy()
+            traces.append((go.Bar(
+                x=df.index, y=_f32(hist),
                 name='Histogram',
-                marker_color=colors,
+                marker=dict(color=(hist >= 0).astype(np.uint8), colorscale=[[0, 'red'], [1, 'green']],
+                            cmin=0, cmax=1),
                 opacity=0.3,
                 showlegend=False
-            ), row=3, col=1)
-        
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=1)
+            ), 3))
+        shapes += MACD_SHAPES
     
     # Row 4: ATR %
     if 'ATR_pct' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['ATR_pct'],
+        traces.append((go.Scattergl(
+            x=df.index, y=_f32(df['ATR_pct']),
             name='ATR%',
             line=dict(color='red', width=2),
             fill='tozeroy',
             fillcolor='rgba(255,0,0,0.1)',
             showlegend=False
-        ), row=4, col=1)
-        
-        # Add volatility zones
-        fig.add_hline(y=2, line_dash="dash", line_color="green", opacity=0.5, row=4, col=1)
-        fig.add_hline(y=3, line_dash="dash", line_color="red", opacity=0.5, row=4, col=1)
-        fig.add_hrect(y0=0, y1=2, fillcolor="green", opacity=0.05, row=4, col=1)
+        ), 4))
+        shapes += ATR_SHAPES
     
     # Row 5: Volume
     if 'Volume' in df.columns:
-        colors = ['green' if df.iloc[i]['Close'] >= df.iloc[i]['Open'] 
-                 else 'red' for i in range(len(df))]
-        
-        fig.add_trace(go.Bar(
-            x=df.index, y=df['Volume'],
+        # Up/down index on a two-stop scale instead of a per-bar colour string
+        up = (df['Close'].to_numpy() >= df['Open'].to_numpy()).astype(np.uint8)
+
+        traces.append((go.Bar(
+            x=df.index, y=_f32(df['Volume']),
             name='Volume',
-            marker_color=colors,
+            marker=dict(color=up, colorscale=[[0, 'red'], [1, 'green']], cmin=0, cmax=1),
             opacity=0.6,
             showlegend=False
-        ), row=5, col=1)
+        ), 5))
         
         # Add volume MA
-        vol_ma = df['Volume'].rolling(20).mean()
-        fig.add_trace(go.Scatter(
-            x=df.index, y=vol_ma,
+        vol_ma = df['Vol_MA20'].to_numpy() if 'Vol_MA20' in df.columns else sma(df['Volume'].to_numpy(), 20)
+        traces.append((go.Scattergl(
+            x=df.index, y=_f32(vol_ma),
             name='Vol MA',
             line=dict(color='blue', width=1, dash='dash'),
             showlegend=False
-        ), row=5, col=1)
+        ), 5))
     
+    for trace, row in traces:
+        trace.update(xaxis=_axis_ref('x', row), yaxis=_axis_ref('y', row))
+    fig.add_traces([t for t, _ in traces])
+
     # Update layout with zoom and interaction features
     fig.update_layout(
         height=900,
+        shapes=shapes,
         showlegend=True,
         legend=dict(
             orientation="h",
@@ -349,7 +550,10 @@ def display_professional_chart(df, current_price, entry_score, risk_score):
         margin=dict(t=100, b=50, l=50, r=50),
         # Enable zoom and pan
         dragmode='zoom',  # Default to zoom mode
-        selectdirection='h'  # Horizontal zoom
+        selectdirection='h',  # Horizontal zoom
+        # Same revision per timeframe → Plotly.js keeps the user's zoom/pan
+        # across refreshes, but resets it when the timeframe changes
+        uirevision=f"spy_chart:{interval}"
     )
     
     # Update x-axes with zoom controls
@@ -368,111 +572,5 @@ def display_professional_chart(df, current_price, entry_score, risk_score):
         gridcolor='rgba(128,128,128,0.2)',
         fixedrange=False  # Allow zooming
     )
-    
-    # Display the chart with zoom config
-    config = {
-        'displayModeBar': True,
-        'displaylogo': False,
-        'modeBarButtonsToAdd': ['drawline', 'drawopenpath', 'eraseshape'],
-        'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-        'toImageButtonOptions': {
-            'format': 'png',
-            'filename': 'spy_iron_condor_chart',
-            'height': 1200,
-            'width': 1600,
-            'scale': 2
-        },
-        'scrollZoom': True  # Enable scroll wheel zoom
-    }
-    
-    st.plotly_chart(fig, use_container_width=True, config=config)
-    
-    # Overall Signal Assessment (collapsible to save space on mobile)
-    st.markdown("---")
-    with st.expander("🎯 Overall Iron Condor Signal Assessment", expanded=True):
-    
-        col1, col2 = st.columns([2, 3])
-    
-        with col1:
-            # Count favorable conditions
-            conditions = []
-            if 40 <= rsi <= 60:
-                conditions.append("✅ RSI in neutral zone")
-            else:
-                conditions.append("❌ RSI extreme")
 
-            if atr_pct < 2:
-                conditions.append("✅ Low volatility")
-            elif atr_pct < 3:
-                conditions.append("🟡 Moderate volatility")
-            else:
-                conditions.append("❌ High volatility")
-
-            if 30 <= bb_position <= 70:
-                conditions.append("✅ Price in BB middle")
-            else:
-                conditions.append("❌ Price at BB edge")
-
-            if abs(macd) < 2:
-                conditions.append("✅ Weak trend")
-            else:
-                conditions.append("❌ Strong trend")
-
-            # Volume check with safety for NaN
-            vol_ma = df['Volume'].rolling(20).mean().iloc[-1] if len(df) >= 20 else df['Volume'].mean()
-            if pd.notna(vol_ma) and pd.notna(volume) and volume < vol_ma * 1.2:
-                conditions.append("✅ Normal volume")
-            elif pd.notna(vol_ma) and pd.notna(volume):
-                conditions.append("🟡 High volume")
-            else:
-                conditions.append("🟡 Volume N/A")
-
-            green_count = sum(1 for c in conditions if c.startswith("✅"))
-
-            st.markdown(f"**Score: {green_count}/5 Favorable**")
-
-            for condition in conditions:
-                st.markdown(condition)
-
-        with col2:
-            if green_count >= 4:
-                st.success(f"""
-                **🟢 STRONG ENTRY SIGNAL**
-
-                **Recommendation:** Open Iron Condor position now
-
-                **Setup:** Use the BALANCED (20Δ) setup below
-                - Conservative: 16Δ for higher win rate
-                - Aggressive: 30Δ for more premium
-
-                **Entry Score:** {entry_score}/10
-                **Risk Score:** {risk_score}/10
-                """)
-            elif green_count >= 3:
-                st.warning(f"""
-                **🟡 MODERATE SIGNAL**
-
-                **Recommendation:** Consider waiting for better conditions
-
-                **What to watch:**
-                - Wait for RSI to reach 40-60
-                - Watch for volatility to drop below 2%
-                - Ensure price moves to middle of Bollinger Bands
-
-                **Entry Score:** {entry_score}/10
-                **Risk Score:** {risk_score}/10
-                """)
-            else:
-                st.error(f"""
-                **🔴 AVOID / EXIT**
-
-                **Recommendation:** Do NOT enter new positions
-
-                **Issues:**
-                - Too many unfavorable conditions
-                - High risk environment for Iron Condors
-                - If holding positions, consider closing
-
-                **Entry Score:** {entry_score}/10
-                **Risk Score:** {risk_score}/10
-                """)
+    return fig